@@ -0,0 +1,150 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+difficulty_level = sa.Enum(
+    "BEGINNER", "INTERMEDIATE", "ADVANCED", name="difficultylevel"
+)
+quest_type = sa.Enum(
+    "COMMAND", "MOTION", "EDITING", "VISUAL", "SEARCH", name="questtype"
+)
+user_status = sa.Enum("ACTIVE", "INACTIVE", "BANNED", name="userstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("telegram_id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=255), nullable=True),
+        sa.Column("first_name", sa.String(length=255), nullable=False),
+        sa.Column("last_name", sa.String(length=255), nullable=True),
+        sa.Column("language_code", sa.String(length=10), nullable=True),
+        sa.Column("status", user_status, nullable=True),
+        sa.Column("total_score", sa.Integer(), nullable=True),
+        sa.Column("current_level", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_activity", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_telegram_id", "users", ["telegram_id"], unique=True)
+
+    op.create_table(
+        "chapters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("difficulty", difficulty_level, nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("unlock_score", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_chapters_id", "chapters", ["id"])
+
+    op.create_table(
+        "quests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chapter_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("quest_type", quest_type, nullable=False),
+        sa.Column("difficulty", difficulty_level, nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("initial_text", sa.Text(), nullable=True),
+        sa.Column("expected_result", sa.Text(), nullable=True),
+        sa.Column("vim_command", sa.String(length=255), nullable=True),
+        sa.Column("hints", sa.JSON(), nullable=True),
+        sa.Column("max_score", sa.Integer(), nullable=True),
+        sa.Column("time_limit", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_quests_id", "quests", ["id"])
+
+    op.create_table(
+        "user_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("quest_id", sa.Integer(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("hints_used", sa.Integer(), nullable=True),
+        sa.Column("time_spent", sa.Integer(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["quest_id"], ["quests.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_progress_id", "user_progress", ["id"])
+
+    op.create_table(
+        "achievements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("icon", sa.String(length=255), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("condition", sa.JSON(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_achievements_id", "achievements", ["id"])
+
+    op.create_table(
+        "user_achievements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("achievement_id", sa.Integer(), nullable=False),
+        sa.Column("earned_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["achievement_id"], ["achievements.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_achievements_id", "user_achievements", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_achievements_id", table_name="user_achievements")
+    op.drop_table("user_achievements")
+    op.drop_index("ix_achievements_id", table_name="achievements")
+    op.drop_table("achievements")
+    op.drop_index("ix_user_progress_id", table_name="user_progress")
+    op.drop_table("user_progress")
+    op.drop_index("ix_quests_id", table_name="quests")
+    op.drop_table("quests")
+    op.drop_index("ix_chapters_id", table_name="chapters")
+    op.drop_table("chapters")
+    op.drop_index("ix_users_telegram_id", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+
+    bind = op.get_bind()
+    user_status.drop(bind, checkfirst=True)
+    quest_type.drop(bind, checkfirst=True)
+    difficulty_level.drop(bind, checkfirst=True)
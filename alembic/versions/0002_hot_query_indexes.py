@@ -0,0 +1,80 @@
+"""Unique progress rows and indexes for hot progress/catalog queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:01
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    (
+        "ix_user_progress_user_completed_quest",
+        "user_progress",
+        ["user_id", "is_completed", "quest_id"],
+        None,
+    ),
+    (
+        "ix_quests_difficulty_active_order",
+        "quests",
+        ["difficulty", "is_active", "order_index"],
+        None,
+    ),
+    (
+        "ix_quests_chapter_active_order",
+        "quests",
+        ["chapter_id", "order_index"],
+        "is_active",
+    ),
+    ("ix_chapters_active_order", "chapters", ["order_index"], "is_active"),
+]
+
+
+def upgrade() -> None:
+    # Keep the earliest row of each (user_id, quest_id) pair, which is the one
+    # the old read-modify-write path kept updating.
+    op.execute(
+        "DELETE FROM user_progress WHERE id NOT IN "
+        "(SELECT MIN(id) FROM user_progress GROUP BY user_id, quest_id)"
+    )
+    with op.batch_alter_table("user_progress") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_user_progress_user_quest", ["user_id", "quest_id"]
+        )
+
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    for name, table, columns, where in INDEXES:
+        predicate = sa.text(where) if where else None
+        if is_postgresql:
+            # Build without blocking writes on large tables.
+            with op.get_context().autocommit_block():
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    postgresql_where=predicate,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        else:
+            op.create_index(
+                name, table, columns, sqlite_where=predicate, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    for name, table, _columns, _where in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    with op.batch_alter_table("user_progress") as batch_op:
+        batch_op.drop_constraint("uq_user_progress_user_quest", type_="unique")
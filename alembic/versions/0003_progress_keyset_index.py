@@ -0,0 +1,40 @@
+"""Index for keyset pagination of user progress
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:02
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_user_progress_user_updated",
+                "user_progress",
+                ["user_id", "updated_at", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            "ix_user_progress_user_updated",
+            "user_progress",
+            ["user_id", "updated_at", "id"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_user_progress_user_updated", table_name="user_progress", if_exists=True
+    )
@@ -0,0 +1,38 @@
+"""Index for keyset scans of users by last activity
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:03
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_users_last_activity",
+                "users",
+                ["last_activity", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            "ix_users_last_activity",
+            "users",
+            ["last_activity", "id"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_last_activity", table_name="users", if_exists=True)
@@ -1,17 +1,37 @@
+import functools
 import hashlib
 import hmac
 import json
 import time
 from urllib.parse import parse_qsl, unquote
 
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
+from app.core.activity import activity_buffer
+from app.core.cache import TTLCache
 from app.core.services.user import user_service
+from app.db.base import get_db
+from app.db.models import User
 
 settings = get_settings()
 
+AUTH_MAX_AGE = 86400
+
+# sha256(init_data) -> user id, kept until the init_data itself expires.
+validated_init_data: TTLCache[bytes, int] = TTLCache(
+    maxsize=settings.auth_cache_size, ttl=AUTH_MAX_AGE
+)
+
+
+@functools.lru_cache(maxsize=4)
+def get_webapp_secret(bot_token: str) -> bytes:
+    """HMAC key for init_data; it only depends on the bot token."""
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
 
 def validate_telegram_auth(init_data: str) -> dict:
     try:
@@ -26,7 +46,7 @@ def validate_telegram_auth(init_data: str) -> dict:
         auth_timestamp = int(auth_date)
         current_timestamp = int(time.time())
 
-        if current_timestamp - auth_timestamp > 86400:
+        if current_timestamp - auth_timestamp > AUTH_MAX_AGE:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Auth data expired"
             )
@@ -37,9 +57,7 @@ def validate_telegram_auth(init_data: str) -> dict:
             f"{k}={v}" for k, v in sorted(parsed_data.items())
         )
 
-        secret_key = hmac.new(
-            b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256
-        ).digest()
+        secret_key = get_webapp_secret(settings.telegram_bot_token)
 
         calculated_hash = hmac.new(
             secret_key, data_check_string.encode(), hashlib.sha256
@@ -58,6 +76,7 @@ def validate_telegram_auth(init_data: str) -> dict:
             "first_name": user_data.get("first_name"),
             "last_name": user_data.get("last_name"),
             "language_code": user_data.get("language_code", "en"),
+            "auth_date": auth_timestamp,
         }
 
     except (ValueError, KeyError, json.JSONDecodeError) as e:
@@ -66,10 +85,21 @@ def validate_telegram_auth(init_data: str) -> dict:
         )
 
 
-def get_current_user(db: Session, init_data: str):
+async def get_current_user(db: AsyncSession, init_data: str):
+    cache_key = hashlib.sha256(init_data.encode()).digest()
+
+    # The same init_data is sent with every Mini App call of a session; once it
+    # has been validated, only the user row has to be loaded again.
+    user_id = validated_init_data.get(cache_key)
+    if user_id is not None:
+        user = await user_service.get_user(db, user_id)
+        if user:
+            activity_buffer.touch(user.id)
+            return user
+
     auth_data = validate_telegram_auth(init_data)
 
-    user = user_service.get_or_create_user(
+    user = await user_service.get_or_create_user(
         db,
         telegram_id=auth_data["user_id"],
         username=auth_data["username"],
@@ -77,4 +107,62 @@ def get_current_user(db: Session, init_data: str):
         last_name=auth_data.get("last_name"),
     )
 
+    validated_init_data.set(
+        cache_key, user.id, expires_at=auth_data["auth_date"] + AUTH_MAX_AGE
+    )
+    return user
+
+
+def create_access_token(user_id: int) -> tuple[str, int]:
+    """Sign a session token for the user; returns it with its lifetime."""
+    expires_in = settings.access_token_expire_minutes * 60
+    now = int(time.time())
+    claims = {"sub": str(user_id), "iat": now, "exp": now + expires_in}
+    token = jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+    return token, expires_in
+
+
+def decode_access_token(token: str) -> int:
+    """Return the user id of a valid, unexpired token."""
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        return int(claims["sub"])
+    except (JWTError, KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from None
+
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> int:
+    """Authenticate a request from its bearer token without touching the DB."""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = decode_access_token(credentials.credentials)
+    activity_buffer.touch(user_id)
+    return user_id
+
+
+async def get_token_user(
+    user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+) -> User:
+    """Load the user row for endpoints that need more than the id."""
+    user = await user_service.get_user(db, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
@@ -1,20 +1,25 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user
-from app.api.schemas import AuthData, UserResponse
+from app.api.auth import create_access_token, get_current_user, get_token_user
+from app.api.schemas import AuthData, TokenResponse, UserResponse
 from app.db.base import get_db
+from app.db.models import User
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=UserResponse)
-async def login(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    return user
+@router.post("/login", response_model=TokenResponse)
+async def login(auth_data: AuthData, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(db, auth_data.init_data)
+    access_token, expires_in = create_access_token(user.id)
+    return TokenResponse(
+        access_token=access_token,
+        expires_in=expires_in,
+        user=UserResponse.model_validate(user),
+    )
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
+async def get_current_user_info(user: User = Depends(get_token_user)):
     return user
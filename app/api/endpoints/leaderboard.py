@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user_id
+from app.api.schemas import LeaderboardRank, LeaderboardResponse
+from app.core.services.leaderboard import leaderboard_service
+from app.db.base import get_db
+
+router = APIRouter()
+
+
+@router.get("", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+):
+    entries = await leaderboard_service.get_top(db)
+    rank = await leaderboard_service.get_rank(user_id)
+
+    return LeaderboardResponse(
+        entries=entries,
+        me=LeaderboardRank(rank=rank[0], score=rank[1]) if rank else None,
+    )
@@ -1,31 +1,47 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-
-from app.api.auth import get_current_user
-from app.api.schemas import (
-    AuthData,
-    ProgressSummary,
-    UserProgressResponse,
-)
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user_id, get_token_user
+from app.api.schemas import ProgressSummary, UserProgressPage
 from app.core.services.game import game_service
 from app.core.services.user import user_service
 from app.db.base import get_db
+from app.db.models import User
 from app.db.repositories.progress import progress_repository
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 200
+
+
+async def get_progress_page(
+    db: AsyncSession, user_id: int, completed_only: bool, limit: int, cursor: str | None
+) -> UserProgressPage:
+    try:
+        items, next_cursor = await progress_repository.get_user_progress_page(
+            db, user_id, completed_only=completed_only, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+    return UserProgressPage(items=items, next_cursor=next_cursor)
+
 
-@router.get("/progress", response_model=list[UserProgressResponse])
-async def get_user_progress(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    progress_list = progress_repository.get_user_progress(db, user.id)
-    return progress_list
+@router.get("/progress", response_model=UserProgressPage)
+async def get_user_progress(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_progress_page(db, user_id, False, limit, cursor)
 
 
 @router.get("/progress/summary", response_model=ProgressSummary)
-async def get_progress_summary(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    summary = game_service.get_user_progress_summary(db, user.id)
+async def get_progress_summary(
+    user: User = Depends(get_token_user), db: AsyncSession = Depends(get_db)
+):
+    summary = await game_service.get_user_progress_summary(db, user.id)
 
     current_level = user_service.calculate_level(user.total_score)
 
@@ -39,8 +55,11 @@ async def get_progress_summary(auth_data: AuthData, db: Session = Depends(get_db
     )
 
 
-@router.get("/progress/completed", response_model=list[UserProgressResponse])
-async def get_completed_quests(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    completed = progress_repository.get_completed_quests(db, user.id)
-    return completed
+@router.get("/progress/completed", response_model=UserProgressPage)
+async def get_completed_quests(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_progress_page(db, user_id, True, limit, cursor)
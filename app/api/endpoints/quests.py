@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from collections.abc import Callable, Iterable
+from typing import Any
 
-from app.api.auth import get_current_user
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user_id, get_token_user
 from app.api.schemas import (
-    AuthData,
     ChapterResponse,
     HintRequest,
     HintResponse,
@@ -11,46 +14,129 @@ from app.api.schemas import (
     QuestResult,
     QuestSubmission,
 )
+from app.config.settings import get_settings
+from app.core.catalog import QuestCatalog
 from app.core.services.game import game_service
 from app.core.services.quest import quest_service
 from app.db.base import get_db
+from app.db.models import User
+
+settings = get_settings()
 
 router = APIRouter()
 
+CHAPTER_FIELDS = tuple(ChapterResponse.model_fields)
+QUEST_FIELDS = tuple(QuestResponse.model_fields)
+
+
+def project(fields: tuple[str, ...], entry: Any) -> dict[str, Any]:
+    """Pick the response schema fields from a catalog entry."""
+    return {name: getattr(entry, name) for name in fields}
+
+
+def render_list(fields: tuple[str, ...], entries: Iterable[Any]) -> bytes:
+    return orjson.dumps([project(fields, entry) for entry in entries])
+
+
+def render_one(fields: tuple[str, ...], entry: Any) -> bytes:
+    return orjson.dumps(project(fields, entry))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+async def catalog_response(
+    request: Request,
+    db: AsyncSession,
+    name: str,
+    render: Callable[[QuestCatalog], bytes],
+) -> Response:
+    """Serve a rendered catalog resource with an ETag tied to its version.
+
+    Catalog content is the same for every user, so responses are public.
+    A matching If-None-Match is answered with 304 from the in-memory catalog
+    before anything is rendered or read from the database. Otherwise the
+    body is serialized once per catalog snapshot and served as raw bytes.
+    """
+    catalog = await quest_service.get_catalog(db)
+    headers = {
+        "ETag": f'"{catalog.version}"',
+        "Cache-Control": f"public, max-age={settings.catalog_cache_max_age}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    content = catalog.rendered(name, render)
+    return Response(content=content, media_type="application/json", headers=headers)
+
 
 @router.get("/chapters", response_model=list[ChapterResponse])
-async def get_chapters(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    chapters = quest_service.get_available_chapters(db)
-    return chapters
+async def get_chapters(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    return await catalog_response(
+        request,
+        db,
+        "chapters",
+        lambda catalog: render_list(CHAPTER_FIELDS, catalog.chapters),
+    )
 
 
 @router.get("/chapters/{chapter_id}/quests", response_model=list[QuestResponse])
 async def get_chapter_quests(
-    chapter_id: int, auth_data: AuthData, db: Session = Depends(get_db)
+    chapter_id: int,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = get_current_user(db, auth_data.init_data)
-    quests = quest_service.get_chapter_quests(db, chapter_id)
-    return quests
+    # Unknown ids share one entry so they cannot grow the rendered cache.
+    catalog = await quest_service.get_catalog(db)
+    if catalog.get_chapter(chapter_id) is None:
+        chapter_id = 0
+
+    return await catalog_response(
+        request,
+        db,
+        f"chapter:{chapter_id}:quests",
+        lambda catalog: render_list(
+            QUEST_FIELDS, catalog.get_chapter_quests(chapter_id)
+        ),
+    )
 
 
 @router.get("/quests/{quest_id}", response_model=QuestResponse)
-async def get_quest(quest_id: int, auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    quest = quest_service.get_quest_by_id(db, quest_id)
+async def get_quest(
+    quest_id: int,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    quest = await quest_service.get_quest_by_id(db, quest_id)
 
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
 
-    return quest
+    return await catalog_response(
+        request,
+        db,
+        f"quest:{quest_id}",
+        lambda catalog: render_one(QUEST_FIELDS, catalog.get_quest(quest_id)),
+    )
 
 
 @router.post("/quests/{quest_id}/start", response_model=QuestResponse)
 async def start_quest(
-    quest_id: int, auth_data: AuthData, db: Session = Depends(get_db)
+    quest_id: int,
+    user: User = Depends(get_token_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = get_current_user(db, auth_data.init_data)
-    quest = game_service.start_quest(db, user, quest_id)
+    quest = await game_service.start_quest(db, user, quest_id)
 
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
@@ -60,11 +146,11 @@ async def start_quest(
 
 @router.post("/quests/submit", response_model=QuestResult)
 async def submit_quest(
-    submission: QuestSubmission, auth_data: AuthData, db: Session = Depends(get_db)
+    submission: QuestSubmission,
+    user: User = Depends(get_token_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = get_current_user(db, auth_data.init_data)
-
-    is_correct, score, message = game_service.submit_answer(
+    is_correct, score, message = await game_service.submit_answer(
         db,
         user,
         submission.quest_id,
@@ -75,7 +161,7 @@ async def submit_quest(
 
     next_quest_id = None
     if is_correct:
-        next_quest = game_service.get_next_recommended_quest(db, user.id)
+        next_quest = await game_service.get_next_recommended_quest(db, user.id)
         if next_quest:
             next_quest_id = next_quest.id
 
@@ -91,11 +177,10 @@ async def submit_quest(
 async def get_quest_hint(
     quest_id: int,
     hint_request: HintRequest,
-    auth_data: AuthData,
-    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = get_current_user(db, auth_data.init_data)
-    quest = quest_service.get_quest_by_id(db, quest_id)
+    quest = await quest_service.get_quest_by_id(db, quest_id)
 
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
@@ -109,9 +194,10 @@ async def get_quest_hint(
 
 
 @router.get("/quests/recommended", response_model=QuestResponse)
-async def get_recommended_quest(auth_data: AuthData, db: Session = Depends(get_db)):
-    user = get_current_user(db, auth_data.init_data)
-    quest = game_service.get_next_recommended_quest(db, user.id)
+async def get_recommended_quest(
+    user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+):
+    quest = await game_service.get_next_recommended_quest(db, user_id)
 
     if not quest:
         raise HTTPException(status_code=404, detail="No recommended quest found")
@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, progress, quests
+from app.api.endpoints import auth, leaderboard, progress, quests
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(quests.router, prefix="/quests", tags=["quests"])
 api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
+api_router.include_router(
+    leaderboard.router, prefix="/leaderboard", tags=["leaderboard"]
+)
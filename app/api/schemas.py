@@ -86,6 +86,11 @@ class UserProgressResponse(BaseModel):
         from_attributes = True
 
 
+class UserProgressPage(BaseModel):
+    items: list[UserProgressResponse]
+    next_cursor: str | None = None
+
+
 class ProgressSummary(BaseModel):
     total_score: int
     total_completed: int
@@ -95,6 +100,26 @@ class ProgressSummary(BaseModel):
     current_level: int
 
 
+class LeaderboardEntryResponse(BaseModel):
+    rank: int
+    user_id: int
+    name: str
+    score: int
+
+    class Config:
+        from_attributes = True
+
+
+class LeaderboardRank(BaseModel):
+    rank: int
+    score: int
+
+
+class LeaderboardResponse(BaseModel):
+    entries: list[LeaderboardEntryResponse]
+    me: LeaderboardRank | None = None
+
+
 class HintRequest(BaseModel):
     quest_id: int
     hints_used: int
@@ -107,3 +132,10 @@ class HintResponse(BaseModel):
 
 class AuthData(BaseModel):
     init_data: str = Field(..., description="Telegram Web App init data")
+
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int = Field(..., description="Token lifetime in seconds")
+    user: UserResponse
@@ -1,10 +1,12 @@
 """Menu navigation handlers for VimMaster bot."""
 
+import html
 import logging
 from typing import Any
 
 from aiogram import F, Router
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.keyboards.main import (
     get_back_to_main_keyboard,
@@ -12,11 +14,18 @@ from app.bot.keyboards.main import (
     get_profile_keyboard,
     get_quest_keyboard,
 )
+from app.config.settings import get_settings
+from app.core.services.leaderboard import leaderboard_service
+from app.db.models import User
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
 router = Router()
 
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
 
 @router.message(F.text == "🎯 Квесты")
 async def quests_menu_handler(message: Message, **kwargs: Any) -> None:
@@ -97,13 +106,34 @@ async def profile_menu_handler(message: Message, **kwargs: Any) -> None:
 
 
 @router.message(F.text == "🏆 Рейтинг")
-async def leaderboard_handler(message: Message, **kwargs: Any) -> None:
+async def leaderboard_handler(
+    message: Message, db: AsyncSession, user: User | None, **kwargs: Any
+) -> None:
     """Handle leaderboard."""
-    # TODO: Get actual leaderboard data
-    leaderboard_text = """🏆 <b>Топ игроков</b>
-
-<b>🥇 ТОП-10 по очкам:</b>
-<i>Пока нет данных</i>
+    # The chat message shows the head of the served top, kept short enough
+    # for Telegram's message length limit.
+    size = min(settings.leaderboard_message_size, settings.leaderboard_size)
+    entries = await leaderboard_service.get_top(db, size)
+    rank = await leaderboard_service.get_rank(user.id) if user else None
+
+    if entries:
+        top_text = "\n".join(
+            f"{MEDALS.get(entry.rank, f'{entry.rank}.')} "
+            f"{html.escape(entry.name)} — {entry.score}"
+            for entry in entries
+        )
+    else:
+        top_text = "<i>Пока нет данных</i>"
+
+    if rank:
+        rank_text = f"Твоё место: <b>{rank[0]}</b> ({rank[1]} очков)"
+    else:
+        rank_text = "<i>Начни проходить квесты, чтобы попасть в рейтинг!</i>"
+
+    leaderboard_text = f"""🏆 <b>Топ игроков</b>
+
+<b>🥇 ТОП-{size} по очкам:</b>
+{top_text}
 
 <b>🔥 Самые активные:</b>
 <i>Пока нет данных</i>
@@ -111,7 +141,7 @@ async def leaderboard_handler(message: Message, **kwargs: Any) -> None:
 <b>⚡ Быстрые решения:</b>
 <i>Пока нет данных</i>
 
-<i>Начни проходить квесты, чтобы попасть в рейтинг!</i>"""
+{rank_text}"""
 
     await message.answer(
         leaderboard_text,
@@ -1,20 +1,33 @@
 """Quest handlers for VimMaster bot."""
 
+import html
 import logging
 
 from aiogram import F, Router
 from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
 from aiogram.types import (
     CallbackQuery,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     Message,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.services.game import game_service
+from app.bot.states import (
+    QuestStates,
+    get_active_quest,
+    save_active_quest,
+    start_active_quest,
+)
+from app.core.services.game import (
+    QUEST_ALREADY_COMPLETED,
+    QUEST_NOT_FOUND,
+    QUEST_NOT_STARTED,
+    game_service,
+)
 from app.core.services.quest import quest_service
-from app.core.services.user import user_service
-from app.db.base import SessionLocal
+from app.db.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -22,30 +35,23 @@ router = Router()
 
 
 @router.message(Command("quest"))
-async def quest_handler(message: Message) -> None:
+async def quest_handler(message: Message, db: AsyncSession, user: User | None) -> None:
     """Handle /quest command - show available quests."""
-    telegram_user = message.from_user
-    if not telegram_user:
+    if not user:
+        await message.answer(
+            "Пользователь не найден. Используйте /start для регистрации."
+        )
         return
 
-    db = SessionLocal()
-    try:
-        user = user_service.get_user_by_telegram_id(db, telegram_user.id)
-        if not user:
-            await message.answer(
-                "Пользователь не найден. Используйте /start для регистрации."
-            )
-            return
-
-        # Get next recommended quest
-        next_quest = game_service.get_next_recommended_quest(db, user.id)
+    # Get next recommended quest
+    next_quest = await game_service.get_next_recommended_quest(db, user.id)
 
-        if not next_quest:
-            await message.answer("🎉 Поздравляем! Вы завершили все доступные квесты!")
-            return
+    if not next_quest:
+        await message.answer("🎉 Поздравляем! Вы завершили все доступные квесты!")
+        return
 
-        # Show quest info
-        quest_text = f"""🎯 <b>Квест: {next_quest.title}</b>
+    # Show quest info
+    quest_text = f"""🎯 <b>Квест: {next_quest.title}</b>
 
 <b>Описание:</b>
 {next_quest.description}
@@ -63,52 +69,49 @@ async def quest_handler(message: Message) -> None:
 
 Готовы начать? Нажмите кнопку ниже!"""
 
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="🎮 Начать квест",
-                        callback_data=f"start_quest:{next_quest.id}",
-                    )
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="💡 Получить подсказку",
-                        callback_data=f"hint:{next_quest.id}:0",
-                    )
-                ],
-            ]
-        )
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="🎮 Начать квест",
+                    callback_data=f"start_quest:{next_quest.id}",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text="💡 Получить подсказку",
+                    callback_data=f"hint:{next_quest.id}:0",
+                )
+            ],
+        ]
+    )
 
-        await message.answer(quest_text, parse_mode="HTML", reply_markup=keyboard)
-    finally:
-        db.close()
+    await message.answer(quest_text, parse_mode="HTML", reply_markup=keyboard)
 
 
 @router.callback_query(F.data.startswith("start_quest:"))
-async def start_quest_callback(callback: CallbackQuery) -> None:
+async def start_quest_callback(
+    callback: CallbackQuery, state: FSMContext, db: AsyncSession, user: User | None
+) -> None:
     """Handle start quest callback."""
-    if not callback.data or not callback.from_user:
+    if not callback.data:
         return
 
     quest_id = int(callback.data.split(":")[1])
 
-    db = SessionLocal()
-    try:
-        user = user_service.get_user_by_telegram_id(db, callback.from_user.id)
-        if not user:
-            await callback.answer("Пользователь не найден.")
-            return
+    if not user:
+        await callback.answer("Пользователь не найден.")
+        return
 
-        quest = game_service.start_quest(db, user, quest_id)
-        if not quest:
-            await callback.answer("Квест не найден.")
-            return
+    quest = await game_service.start_quest(db, user, quest_id)
+    if not quest:
+        await callback.answer("Квест не найден.")
+        return
 
-        await callback.answer("Квест начат! Введите вашу Vim команду.")
+    await start_active_quest(state, quest.id)
+    await callback.answer("Квест начат! Введите вашу Vim команду.")
 
-        # Set up quest state (in real app, you'd use FSM)
-        start_text = f"""🎮 <b>Квест начат: {quest.title}</b>
+    start_text = f"""🎮 <b>Квест начат: {quest.title}</b>
 
 Введите Vim команду для выполнения задания.
 
@@ -120,32 +123,31 @@ async def start_quest_callback(callback: CallbackQuery) -> None:
 
 <i>Введите команду в следующем сообщении...</i>"""
 
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="💡 Подсказка", callback_data=f"hint:{quest.id}:0"
-                    )
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="❌ Отменить", callback_data=f"cancel_quest:{quest.id}"
-                    )
-                ],
-            ]
-        )
-
-        if callback.message:
-            await callback.message.edit_text(
-                start_text, parse_mode="HTML", reply_markup=keyboard
-            )
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="💡 Подсказка", callback_data=f"hint:{quest.id}:0"
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text="❌ Отменить", callback_data=f"cancel_quest:{quest.id}"
+                )
+            ],
+        ]
+    )
 
-    finally:
-        db.close()
+    if callback.message:
+        await callback.message.edit_text(
+            start_text, parse_mode="HTML", reply_markup=keyboard
+        )
 
 
 @router.callback_query(F.data.startswith("hint:"))
-async def hint_callback(callback: CallbackQuery) -> None:
+async def hint_callback(
+    callback: CallbackQuery, state: FSMContext, db: AsyncSession
+) -> None:
     """Handle hint request callback."""
     if not callback.data or not callback.from_user:
         return
@@ -154,134 +156,151 @@ async def hint_callback(callback: CallbackQuery) -> None:
     quest_id = int(parts[1])
     hints_used = int(parts[2])
 
-    db = SessionLocal()
-    try:
-        quest = quest_service.get_quest_by_id(db, quest_id)
-        if not quest:
-            await callback.answer("Квест не найден.")
-            return
+    quest = await quest_service.get_quest_by_id(db, quest_id)
+    if not quest:
+        await callback.answer("Квест не найден.")
+        return
 
-        hint = game_service.get_quest_hints(quest, hints_used)
-        if not hint:
-            await callback.answer("Больше подсказок нет!")
-            return
+    hint = game_service.get_quest_hints(quest, hints_used)
+    if not hint:
+        await callback.answer("Больше подсказок нет!")
+        return
 
-        hint_text = f"💡 <b>Подсказка {hints_used + 1}:</b>\n{hint}"
+    active = await get_active_quest(state)
+    if active and active.quest_id == quest_id:
+        active.hints_used = max(active.hints_used, hints_used + 1)
+        await save_active_quest(state, active)
 
-        # Update keyboard with next hint button
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="💡 Еще подсказка",
-                        callback_data=f"hint:{quest_id}:{hints_used + 1}",
-                    )
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="❌ Отменить", callback_data=f"cancel_quest:{quest_id}"
-                    )
-                ],
-            ]
-        )
+    hint_text = f"💡 <b>Подсказка {hints_used + 1}:</b>\n{hint}"
 
-        await callback.answer()
-        await callback.message.answer(hint_text, parse_mode="HTML")
+    # Update keyboard with next hint button
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="💡 Еще подсказка",
+                    callback_data=f"hint:{quest_id}:{hints_used + 1}",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text="❌ Отменить", callback_data=f"cancel_quest:{quest_id}"
+                )
+            ],
+        ]
+    )
 
-    finally:
-        db.close()
+    await callback.answer()
+    await callback.message.answer(hint_text, parse_mode="HTML")
 
 
-@router.message(
-    F.text.startswith(":") | F.text.startswith(".") | F.text.startswith("g")
-)
-async def quest_answer_handler(message: Message) -> None:
-    """Handle potential quest answer (Vim command)."""
-    telegram_user = message.from_user
-    if not telegram_user or not message.text:
+@router.message(QuestStates.answering, F.text)
+async def quest_answer_handler(
+    message: Message, state: FSMContext, db: AsyncSession, user: User | None
+) -> None:
+    """Handle an answer (Vim command) to the quest the chat has started."""
+    if not message.text:
         return
 
-    db = SessionLocal()
-    try:
-        user = user_service.get_user_by_telegram_id(db, telegram_user.id)
-        if not user:
-            return
-
-        # Get the next recommended quest (simplified - in real app use FSM)
-        next_quest = game_service.get_next_recommended_quest(db, user.id)
-        if not next_quest:
-            return
+    active = await get_active_quest(state)
+    if not active:
+        await state.clear()
+        return
 
-        # Submit answer
-        is_correct, score, result_message = game_service.submit_answer(
-            db, user, next_quest.id, message.text
-        )
+    if not user:
+        return
 
-        if is_correct:
-            success_text = f"""✅ <b>Правильно!</b>
+    quest = await quest_service.get_quest_by_id(db, active.quest_id)
+    if not quest:
+        await state.clear()
+        return
 
-{result_message}
+    # Submit answer
+    is_correct, score, result_message = await game_service.submit_answer(
+        db,
+        user,
+        quest.id,
+        message.text,
+        time_spent=active.time_spent,
+        hints_used=active.hints_used,
+    )
+
+    if result_message in (QUEST_NOT_FOUND, QUEST_NOT_STARTED, QUEST_ALREADY_COMPLETED):
+        # Nothing was checked, so further messages would not be answers either.
+        await state.clear()
+        status_text = (
+            "✅ Этот квест уже пройден."
+            if result_message == QUEST_ALREADY_COMPLETED
+            else "Этот квест не начат."
+        )
+        await message.answer(f"{status_text}\n\nВыберите квест: /quest")
+        return
 
-<b>Команда:</b> <code>{message.text}</code>
-<b>Получено очков:</b> {score}
+    command = html.escape(message.text)
 
-🎉 Квест "{next_quest.title}" завершен!"""
-
-            # Show next quest button
-            next_quest_after = game_service.get_next_recommended_quest(db, user.id)
-            if next_quest_after:
-                keyboard = InlineKeyboardMarkup(
-                    inline_keyboard=[
-                        [
-                            InlineKeyboardButton(
-                                text="➡️ Следующий квест",
-                                callback_data=f"start_quest:{next_quest_after.id}",
-                            )
-                        ]
-                    ]
-                )
-                await message.answer(
-                    success_text, parse_mode="HTML", reply_markup=keyboard
-                )
-            else:
-                await message.answer(
-                    success_text + "\n\n🏆 Вы завершили все доступные квесты!",
-                    parse_mode="HTML",
-                )
-        else:
-            failure_text = f"""❌ <b>Неправильно</b>
+    if is_correct:
+        await state.clear()
+        success_text = f"""✅ <b>Правильно!</b>
 
 {result_message}
 
-<b>Ваша команда:</b> <code>{message.text}</code>
+<b>Команда:</b> <code>{command}</code>
+<b>Получено очков:</b> {score}
 
-Попробуйте еще раз или используйте подсказку."""
+🎉 Квест "{quest.title}" завершен!"""
 
+        # Show next quest button
+        next_quest_after = await game_service.get_next_recommended_quest(db, user.id)
+        if next_quest_after:
             keyboard = InlineKeyboardMarkup(
                 inline_keyboard=[
                     [
                         InlineKeyboardButton(
-                            text="💡 Подсказка", callback_data=f"hint:{next_quest.id}:0"
-                        )
-                    ],
-                    [
-                        InlineKeyboardButton(
-                            text="🔄 Попробовать снова",
-                            callback_data=f"start_quest:{next_quest.id}",
+                            text="➡️ Следующий квест",
+                            callback_data=f"start_quest:{next_quest_after.id}",
                         )
-                    ],
+                    ]
                 ]
             )
+            await message.answer(success_text, parse_mode="HTML", reply_markup=keyboard)
+        else:
+            await message.answer(
+                success_text + "\n\n🏆 Вы завершили все доступные квесты!",
+                parse_mode="HTML",
+            )
+    else:
+        failure_text = f"""❌ <b>Неправильно</b>
+
+{result_message}
+
+<b>Ваша команда:</b> <code>{command}</code>
+
+Попробуйте еще раз или используйте подсказку."""
 
-            await message.answer(failure_text, parse_mode="HTML", reply_markup=keyboard)
+        keyboard = InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="💡 Подсказка",
+                        callback_data=f"hint:{quest.id}:{active.hints_used}",
+                    )
+                ],
+                [
+                    InlineKeyboardButton(
+                        text="🔄 Попробовать снова",
+                        callback_data=f"start_quest:{quest.id}",
+                    )
+                ],
+            ]
+        )
 
-    finally:
-        db.close()
+        await message.answer(failure_text, parse_mode="HTML", reply_markup=keyboard)
 
 
 @router.callback_query(F.data.startswith("cancel_quest:"))
-async def cancel_quest_callback(callback: CallbackQuery) -> None:
+async def cancel_quest_callback(callback: CallbackQuery, state: FSMContext) -> None:
     """Handle quest cancellation."""
+    await state.clear()
     await callback.answer("Квест отменен.")
     if callback.message:
         await callback.message.edit_text(
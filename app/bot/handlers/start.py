@@ -6,11 +6,12 @@ from typing import Any
 from aiogram import Router, html
 from aiogram.filters import Command, CommandStart
 from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.keyboards.main import get_main_keyboard
 from app.core.services.game import game_service
 from app.core.services.user import user_service
-from app.db.base import SessionLocal
+from app.db.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ router = Router()
 
 
 @router.message(CommandStart())
-async def start_handler(message: Message, **kwargs: Any) -> None:
+async def start_handler(message: Message, db: AsyncSession, **kwargs: Any) -> None:
     """
     Handle /start command.
 
@@ -32,17 +33,15 @@ async def start_handler(message: Message, **kwargs: Any) -> None:
     logger.info(f"User {telegram_user.id} ({telegram_user.username}) started the bot")
 
     # Create or get user from database
-    db = SessionLocal()
-    try:
-        user = user_service.get_or_create_user(
-            db,
-            telegram_id=telegram_user.id,
-            username=telegram_user.username,
-            first_name=telegram_user.first_name,
-            last_name=telegram_user.last_name,
-        )
+    user = await user_service.get_or_create_user(
+        db,
+        telegram_id=telegram_user.id,
+        username=telegram_user.username,
+        first_name=telegram_user.first_name,
+        last_name=telegram_user.last_name,
+    )
 
-        welcome_text = f"""🎮 <b>Добро пожаловать в VimMaster!</b>
+    welcome_text = f"""🎮 <b>Добро пожаловать в VimMaster!</b>
 
 Привет, {html.bold(telegram_user.first_name)}! 👋
 
@@ -61,13 +60,11 @@ VimMaster — это интерактивная игра для изучения
 
 Выбери действие в меню ниже:"""
 
-        await message.answer(
-            welcome_text,
-            reply_markup=get_main_keyboard(),
-            parse_mode="HTML",
-        )
-    finally:
-        db.close()
+    await message.answer(
+        welcome_text,
+        reply_markup=get_main_keyboard(),
+        parse_mode="HTML",
+    )
 
 
 @router.message(Command("help"))
@@ -132,26 +129,25 @@ async def donate_handler(message: Message) -> None:
 
 
 @router.message(Command("profile"))
-async def profile_handler(message: Message) -> None:
+async def profile_handler(
+    message: Message, db: AsyncSession, user: User | None
+) -> None:
     """Handle /profile command."""
     telegram_user = message.from_user
     if not telegram_user:
         return
 
-    db = SessionLocal()
-    try:
-        user = user_service.get_user_by_telegram_id(db, telegram_user.id)
-        if not user:
-            await message.answer(
-                "Пользователь не найден. Используйте /start для регистрации."
-            )
-            return
+    if not user:
+        await message.answer(
+            "Пользователь не найден. Используйте /start для регистрации."
+        )
+        return
 
-        # Get user progress summary
-        progress_summary = game_service.get_user_progress_summary(db, user.id)
-        current_level = user_service.calculate_level(user.total_score)
+    # Get user progress summary
+    progress_summary = await game_service.get_user_progress_summary(db, user.id)
+    current_level = user_service.calculate_level(user.total_score)
 
-        profile_text = f"""👤 <b>Профиль игрока</b>
+    profile_text = f"""👤 <b>Профиль игрока</b>
 
 <b>Имя:</b> {html.bold(telegram_user.first_name or "Не указано")}
 <b>Username:</b> @{telegram_user.username or "не установлен"}
@@ -169,6 +165,4 @@ async def profile_handler(message: Message) -> None:
 
 <i>Продолжайте проходить квесты, чтобы улучшить статистику!</i>"""
 
-        await message.answer(profile_text, parse_mode="HTML")
-    finally:
-        db.close()
+    await message.answer(profile_text, parse_mode="HTML")
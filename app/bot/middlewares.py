@@ -0,0 +1,139 @@
+"""Dispatcher middlewares for VimMaster bot."""
+
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject, Update, User
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.activity import activity_buffer
+from app.core.rate_limit import bot_rate_limiter
+from app.core.services.user import user_service
+from app.db.query_stats import log_query_stats, track_queries
+
+# Session of the update being handled in this task, if any.
+update_session: ContextVar[AsyncSession | None] = ContextVar(
+    "update_session", default=None
+)
+
+
+class QueryStatsMiddleware(BaseMiddleware):
+    """Log how many SQL statements each update issued."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with track_queries() as stats:
+            try:
+                return await handler(event, data)
+            finally:
+                label = (
+                    f"Update {event.update_id} ({event.event_type})"
+                    if isinstance(event, Update)
+                    else type(event).__name__
+                )
+                log_query_stats(label, stats)
+
+
+class RateLimitMiddleware(BaseMiddleware):
+    """Drop updates from users who are over their token bucket.
+
+    Runs before any handler, so flooding costs one Redis call and no DB work.
+    A throttled button press is still answered so the client stops waiting.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        wait = await bot_rate_limiter.hit(user.id)
+        if not wait:
+            return await handler(event, data)
+
+        if isinstance(event, Update) and event.callback_query:
+            await event.callback_query.answer(
+                f"⏳ Слишком часто. Подождите {wait:.0f} сек."
+            )
+        return None
+
+
+class DatabaseSessionMiddleware(BaseMiddleware):
+    """Open one session per update and pass it to handlers as ``db``.
+
+    The transaction is committed when the handler returns and rolled back
+    if it raises. The session only takes a connection once it is first used.
+    The one exception is a reply that has to wait in the SendQueue: the work
+    done so far is committed before the wait (release_update_session), so
+    the wait does not hold a pooled connection.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with self.session_factory() as db:
+            data["db"] = db
+            token = update_session.set(db)
+            try:
+                result = await handler(event, data)
+            except Exception:
+                await db.rollback()
+                raise
+            finally:
+                update_session.reset(token)
+            if db.in_transaction():
+                await db.commit()
+            return result
+
+
+async def release_update_session() -> None:
+    """Commit the current update's transaction and return its connection."""
+    db = update_session.get()
+    if db is not None and db.in_transaction():
+        await db.commit()
+
+
+class UserMiddleware(BaseMiddleware):
+    """Pass the sender's ``User`` row (or None) to handlers as ``user``.
+
+    Registered as an inner middleware, so it runs only for the handler that
+    matched, and the row is loaded only if that handler takes ``user``, by
+    primary key once the sender's id is cached. Resolving the sender also
+    records their activity.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject | None = data.get("handler")
+        telegram_user: User | None = data.get("event_from_user")
+        if handler_object and "user" in handler_object.params:
+            user = None
+            if telegram_user:
+                user = await user_service.get_user_by_telegram_id(
+                    data["db"], telegram_user.id
+                )
+            if user:
+                activity_buffer.touch(user.id)
+            data["user"] = user
+        return await handler(event, data)
@@ -0,0 +1,124 @@
+"""Streak reminders for VimMaster bot.
+
+A streak resets ``streak_reset_hours`` after a user's last activity; users
+get a reminder ``streak_reminder_lead_hours`` before that. Each pass walks
+users in (last_activity, id) order with a keyset scan, from where the
+previous pass stopped up to the activity time that is due now, so every
+idle period is reminded once and no page costs more than the first.
+
+The scan position is checkpointed in Redis after every batch. A pass that
+is interrupted resumes after its last finished batch; only the batch in
+progress may be sent twice. Reminders go out ``streak_reminder_concurrency``
+at a time through the bot's SendQueue, which keeps them under Telegram's
+limits, while the next batch is read from the database.
+"""
+
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError
+
+from app.config.database import get_session
+from app.config.settings import get_settings
+from app.core.cache import get_redis
+from app.db.repositories.base import decode_cursor, encode_cursor
+from app.db.repositories.user import user_repository
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+REMINDER_TEXT = (
+    "🔥 <b>Серия под угрозой!</b>\n\n"
+    "Через {hours} ч. твоя серия сгорит. "
+    "Пройди квест, чтобы её сохранить: /quest"
+)
+
+
+def hours_left(resets_at: datetime, now: datetime) -> int:
+    return max(1, math.ceil((resets_at - now) / timedelta(hours=1)))
+
+
+class StreakReminders:
+    def __init__(self):
+        self.user_repository = user_repository
+
+    async def _read_batch(
+        self, after: tuple[datetime, int], until: datetime
+    ) -> list[tuple[int, int, datetime]]:
+        async with get_session() as db:
+            return await self.user_repository.get_idle_batch(
+                db, after=after, until=until, limit=settings.streak_reminder_batch_size
+            )
+
+    async def _remind(
+        self, bot: Bot, slots: asyncio.Semaphore, telegram_id: int, hours: int
+    ) -> bool:
+        async with slots:
+            try:
+                await bot.send_message(telegram_id, REMINDER_TEXT.format(hours=hours))
+                return True
+            except TelegramForbiddenError:
+                return False  # The user blocked the bot
+            except TelegramAPIError as e:
+                logger.warning(f"Streak reminder to {telegram_id} failed: {e}")
+                return False
+
+    async def run_pass(self, bot: Bot, now: datetime | None = None) -> int:
+        """Remind every user now due; returns the number of reminders sent."""
+        now = now or datetime.utcnow()
+        reset = timedelta(hours=settings.streak_reset_hours)
+        key = settings.streak_reminder_key
+        redis = get_redis()
+
+        saved = await redis.hgetall(key)
+        # Streaks that have already reset are not worth a reminder.
+        after = (now - reset, 0)
+        if b"cursor" in saved:
+            after = max(after, decode_cursor(saved[b"cursor"].decode()))
+        if b"until" in saved:
+            until = datetime.fromisoformat(saved[b"until"].decode())
+        else:
+            until = now - reset + timedelta(hours=settings.streak_reminder_lead_hours)
+            await redis.hset(key, "until", until.isoformat())
+
+        slots = asyncio.Semaphore(settings.streak_reminder_concurrency)
+        sent = 0
+        batch = await self._read_batch(after, until)
+        while batch:
+            last_id, _, last_activity = batch[-1]
+            after = (last_activity, last_id)
+            # Read the next batch while this one is being sent.
+            async with asyncio.TaskGroup() as tasks:
+                next_batch = tasks.create_task(self._read_batch(after, until))
+                reminders = [
+                    tasks.create_task(
+                        self._remind(
+                            bot, slots, telegram_id, hours_left(at + reset, now)
+                        )
+                    )
+                    for _, telegram_id, at in batch
+                ]
+            sent += sum(reminder.result() for reminder in reminders)
+            await redis.hset(key, "cursor", encode_cursor(*after))
+            batch = next_batch.result()
+
+        await redis.hdel(key, "until")
+        return sent
+
+    async def run(self, bot: Bot) -> None:
+        """Run a pass every ``streak_reminder_interval`` seconds until cancelled."""
+        while True:
+            try:
+                sent = await self.run_pass(bot)
+                if sent:
+                    logger.info(f"Sent {sent} streak reminders")
+            except Exception as e:
+                logger.error(f"Streak reminder pass failed: {e}")
+            await asyncio.sleep(settings.streak_reminder_interval)
+
+
+streak_reminders = StreakReminders()
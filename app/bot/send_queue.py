@@ -0,0 +1,137 @@
+"""Outbound pacing for VimMaster bot.
+
+Telegram allows about one message per second to a chat and about thirty
+per second overall, and answers 429 (``RetryAfter``) past that. SendQueue
+is a request middleware on the bot session, so every Bot API call that
+posts to a chat — handler replies, edits and broadcasts — waits for a
+token from its chat's bucket and the global bucket before it is sent.
+The buckets are shared by all workers through Redis.
+
+A flood wait still slipping through pauses every send until Telegram's
+``retry_after`` has passed, then the call is retried. Under a burst, calls
+queue up and go out at the allowed rate instead of failing.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from app.bot.middlewares import release_update_session
+from app.config.settings import get_settings
+from app.core.rate_limit import RateLimiter
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class SendLimiter(RateLimiter):
+    """Token buckets per chat and for the whole bot."""
+
+    async def hit(self, subject: str | int) -> float:
+        # Switched separately from inbound flood control: turning that off
+        # must not let replies run into Telegram's own limits.
+        if not settings.send_pacing_enabled:
+            return 0.0
+        return await self._take(subject)
+
+    def _limits(self, subject: str) -> dict[str, tuple[float, int]]:
+        prefix = f"{settings.rate_limit_key_prefix}:{self.name}"
+        return {
+            f"{prefix}:chat:{subject}": (
+                settings.send_chat_rate,
+                settings.send_chat_burst,
+            ),
+            f"{prefix}:global": (
+                settings.send_global_rate,
+                settings.send_global_burst,
+            ),
+        }
+
+
+class SendQueue(BaseRequestMiddleware):
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.limiter = SendLimiter("send")
+        self._resume_at = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and counters since start."""
+        return {
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "paused_for": round(max(0.0, self._resume_at - time.monotonic()), 1),
+        }
+
+    async def _sleep(self, seconds: float) -> None:
+        # A reply waiting its turn must not keep the update's pooled connection.
+        await release_update_session()
+        await asyncio.sleep(seconds)
+
+    async def _wait_turn(self, chat_id: int | str) -> None:
+        pause = self._resume_at - time.monotonic()
+        if pause > 0:
+            await self._sleep(pause)
+        while wait := await self.limiter.hit(chat_id):
+            await self._sleep(wait)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            # Callback answers, inline edits and bot metadata are not paced.
+            return await make_request(bot, method)
+
+        attempt = 0
+        while True:
+            self.waiting += 1
+            try:
+                await self._wait_turn(chat_id)
+            finally:
+                self.waiting -= 1
+
+            self.in_flight += 1
+            try:
+                response = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    self.failed += 1
+                    raise
+                attempt += 1
+                self.retried += 1
+                self._resume_at = max(self._resume_at, time.monotonic() + e.retry_after)
+                logger.warning(
+                    f"Flood wait of {e.retry_after}s on {type(method).__name__}, "
+                    f"retry {attempt}/{self.max_retries}"
+                )
+                continue
+            finally:
+                self.in_flight -= 1
+
+            self.sent += 1
+            return response
+
+
+send_queue = SendQueue(max_retries=settings.send_max_retries)
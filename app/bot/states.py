@@ -0,0 +1,55 @@
+"""FSM states for VimMaster bot.
+
+State lives in the Dispatcher storage (Redis in production), so an active
+quest survives restarts and is visible to every bot worker.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+
+
+class QuestStates(StatesGroup):
+    answering = State()
+
+
+@dataclass(slots=True)
+class ActiveQuest:
+    """The quest a chat is answering, as stored in the FSM data."""
+
+    quest_id: int
+    started_at: float
+    hints_used: int = 0
+
+    @property
+    def time_spent(self) -> int:
+        return int(time.time() - self.started_at)
+
+
+async def start_active_quest(state: FSMContext, quest_id: int) -> ActiveQuest:
+    """Make ``quest_id`` the chat's active quest.
+
+    Restarting the quest that is already active keeps its start time and
+    hint count, so a retry does not reset the time and hint penalties.
+    """
+    active = await get_active_quest(state)
+    if active and active.quest_id == quest_id:
+        return active
+
+    active = ActiveQuest(quest_id=quest_id, started_at=time.time())
+    await state.set_state(QuestStates.answering)
+    await state.set_data(asdict(active))
+    return active
+
+
+async def get_active_quest(state: FSMContext) -> ActiveQuest | None:
+    data = await state.get_data()
+    if "quest_id" not in data:
+        return None
+    return ActiveQuest(**data)
+
+
+async def save_active_quest(state: FSMContext, active: ActiveQuest) -> None:
+    await state.set_data(asdict(active))
@@ -0,0 +1,75 @@
+"""Webhook ingestion for VimMaster bot.
+
+Telegram POSTs each update to the webhook route, which checks the secret
+token, hands the update to an UpdateFeeder and answers 200 at once.
+The feeder processes updates in background tasks, at most
+``webhook_max_concurrency`` at a time. Past ``webhook_max_pending`` queued
+updates the route answers 503, and Telegram redelivers the update later.
+Any number of stateless workers can share the webhook behind a load balancer.
+"""
+
+import asyncio
+import contextvars
+import hmac
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def check_secret_token(received: str | None) -> bool:
+    expected = settings.telegram_webhook_secret_token
+    if not expected or received is None:
+        return False
+    return hmac.compare_digest(received.encode(), expected.encode())
+
+
+class UpdateFeeder:
+    def __init__(self, dispatcher: Dispatcher, max_concurrency: int, max_pending: int):
+        self.dispatcher = dispatcher
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Updates accepted but not yet fully processed."""
+        return len(self._tasks)
+
+    def submit(self, bot: Bot, update: Update) -> bool:
+        """Schedule an update; False if the backlog is full."""
+        if len(self._tasks) >= self.max_pending:
+            return False
+
+        # A fresh context keeps the update out of the request's query stats.
+        task = asyncio.create_task(
+            self._feed(bot, update), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _feed(self, bot: Bot, update: Update) -> None:
+        async with self._slots:
+            try:
+                await self.dispatcher.feed_update(bot, update)
+            except Exception as e:
+                logger.error(f"Failed to process update {update.update_id}: {e}")
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for accepted updates to finish, then cancel the rest."""
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} unfinished updates")
@@ -1,8 +1,13 @@
 """Database configuration and connection management."""
 
 import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
-from app.db.base import create_tables
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import async_session_factory, engine, read_engine, replica_engine
+from app.db.models import Base
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +15,45 @@ logger = logging.getLogger(__name__)
 async def init_database() -> None:
     """Initialize database connection and create tables if needed."""
     logger.info("Initializing database connection...")
-    create_tables()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+        raise
     logger.info("Database connection established successfully")
 
 
 async def close_database() -> None:
     """Close database connections."""
     logger.info("Closing database connections...")
+    await engine.dispose()
+    for extra_engine in (read_engine, replica_engine):
+        if extra_engine is not None:
+            await extra_engine.dispose()
     logger.info("Database connections closed")
+
+
+async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async session, rolling back on error."""
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async context manager around a database session."""
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
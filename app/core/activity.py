@@ -0,0 +1,77 @@
+"""Write-behind buffer for users.last_activity.
+
+Authenticated requests and bot commands only record the time in memory;
+a background task writes everything collected since the last flush in one
+bulk UPDATE every ``activity_flush_interval`` seconds, sooner when the
+buffer reaches ``activity_buffer_size`` users, and once more on shutdown.
+At most one interval of activity is lost if a worker dies.
+"""
+
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+
+from app.config.database import get_session
+from app.config.settings import get_settings
+from app.db.repositories.user import user_repository
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBuffer:
+    def __init__(self):
+        self.user_repository = user_repository
+        self._pending: dict[int, datetime] = {}
+        self._full = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, user_id: int, at: datetime | None = None) -> None:
+        self._pending[user_id] = at or datetime.utcnow()
+        if len(self._pending) >= settings.activity_buffer_size:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """Write buffered timestamps; a failed or cancelled write keeps them."""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        self._full.clear()
+        try:
+            async with get_session() as db:
+                await self.user_repository.update_last_activity_bulk(db, pending)
+        except BaseException:
+            # Newer timestamps recorded meanwhile win over the unwritten batch.
+            self._pending = {**pending, **self._pending}
+            raise
+
+        logger.debug(f"Flushed last_activity for {len(pending)} users")
+        return len(pending)
+
+    async def run(self) -> None:
+        """Flush periodically until cancelled, then flush what is left."""
+        try:
+            while True:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._full.wait(), timeout=settings.activity_flush_interval
+                    )
+                await self._safe_flush()
+        finally:
+            # Shielded so a second cancellation during shutdown cannot cut
+            # the last write short.
+            await asyncio.shield(self._safe_flush())
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush user activity: {e}")
+
+
+activity_buffer = ActivityBuffer()
@@ -0,0 +1,164 @@
+"""Shared Redis cache tier.
+
+Values live under ``<cache_key_prefix>:<namespace>:<key>`` with a TTL. A
+namespace is invalidated by deleting its keys and publishing its name on
+``cache_invalidation_channel``; every API and bot worker runs
+``listen_for_invalidations`` and drops its in-process copies when a message
+arrives. Redis errors are logged and treated as cache misses so an outage
+only costs extra database reads.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+_redis: Redis | None = None
+_invalidation_handlers: dict[str, list[Callable[[], None]]] = {}
+
+
+def get_redis() -> Redis:
+    """Get the process-wide Redis client, creating it if needed."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def on_invalidate(namespace: str, handler: Callable[[], None]) -> None:
+    """Call ``handler`` whenever any worker invalidates ``namespace``."""
+    _invalidation_handlers.setdefault(namespace, []).append(handler)
+
+
+def dispatch_invalidation(namespace: str) -> None:
+    for handler in _invalidation_handlers.get(namespace, []):
+        handler()
+
+
+async def listen_for_invalidations() -> None:
+    """Apply invalidations published by other workers until cancelled."""
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.cache_invalidation_channel)
+            while True:
+                # Poll with an explicit timeout so an idle channel is not
+                # mistaken for a dead connection by socket_timeout.
+                message = await pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                namespace = message["data"].decode()
+                logger.info(f"Cache namespace {namespace!r} invalidated")
+                dispatch_invalidation(namespace)
+        except RedisError as e:
+            logger.warning(f"Cache invalidation listener disconnected: {e}")
+            await asyncio.sleep(settings.redis_reconnect_delay)
+        finally:
+            await pubsub.aclose()
+
+
+class RedisCache:
+    """Byte values in one Redis namespace."""
+
+    def __init__(self, namespace: str, ttl: int | None = None):
+        self.namespace = namespace
+        self.ttl = ttl if ttl is not None else settings.cache_ttl_seconds
+
+    def _key(self, key: str) -> str:
+        return f"{settings.cache_key_prefix}:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        if not settings.cache_enabled:
+            return None
+        try:
+            return await get_redis().get(self._key(key))
+        except RedisError as e:
+            logger.warning(f"Cache read {self.namespace}:{key} failed: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        if not settings.cache_enabled:
+            return
+        try:
+            await get_redis().set(self._key(key), value, ex=ttl or self.ttl)
+        except RedisError as e:
+            logger.warning(f"Cache write {self.namespace}:{key} failed: {e}")
+
+    async def invalidate(self) -> None:
+        """Delete every key in the namespace and notify all workers."""
+        dispatch_invalidation(self.namespace)
+        if not settings.cache_enabled:
+            return
+        try:
+            redis = get_redis()
+            keys = [key async for key in redis.scan_iter(match=self._key("*"))]
+            if keys:
+                await redis.unlink(*keys)
+            await redis.publish(settings.cache_invalidation_channel, self.namespace)
+        except RedisError as e:
+            logger.warning(f"Cache invalidation of {self.namespace} failed: {e}")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """Bounded in-process LRU whose entries expire at a wall-clock time."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[KeyType, tuple[ValueType, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(
+        self, key: KeyType, value: ValueType, *, expires_at: float | None = None
+    ) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: KeyType) -> ValueType | None:
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,236 @@
+"""In-process snapshot of the quest catalog.
+
+Chapters and quests only change when content is edited, so they are loaded
+once into an immutable QuestCatalog and every lookup after that is a dict
+or tuple access. Reloading builds a new snapshot and swaps it in; readers
+holding the old one keep a consistent view.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import asdict, astuple, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Chapter, DifficultyLevel, Quest, QuestType
+from app.db.repositories.quest import chapter_repository, quest_repository
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogChapter:
+    id: int
+    title: str
+    description: str | None
+    difficulty: DifficultyLevel
+    order_index: int
+    is_active: bool
+    unlock_score: int
+    created_at: datetime | None
+
+    @classmethod
+    def from_model(cls, chapter: Chapter) -> "CatalogChapter":
+        return cls(
+            id=chapter.id,
+            title=chapter.title,
+            description=chapter.description,
+            difficulty=chapter.difficulty,
+            order_index=chapter.order_index,
+            is_active=bool(chapter.is_active),
+            unlock_score=chapter.unlock_score or 0,
+            created_at=chapter.created_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CatalogChapter":
+        return cls(
+            **{
+                **data,
+                "difficulty": DifficultyLevel(data["difficulty"]),
+                "created_at": _parse_datetime(data["created_at"]),
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogQuest:
+    id: int
+    chapter_id: int
+    title: str
+    description: str
+    quest_type: QuestType
+    difficulty: DifficultyLevel
+    order_index: int
+    initial_text: str | None
+    expected_result: str | None
+    vim_command: str | None
+    hints: tuple[str, ...] | None
+    max_score: int
+    time_limit: int | None
+    is_active: bool
+    created_at: datetime | None
+
+    @classmethod
+    def from_model(cls, quest: Quest) -> "CatalogQuest":
+        return cls(
+            id=quest.id,
+            chapter_id=quest.chapter_id,
+            title=quest.title,
+            description=quest.description,
+            quest_type=quest.quest_type,
+            difficulty=quest.difficulty,
+            order_index=quest.order_index,
+            initial_text=quest.initial_text,
+            expected_result=quest.expected_result,
+            vim_command=quest.vim_command,
+            hints=tuple(quest.hints) if quest.hints is not None else None,
+            max_score=quest.max_score if quest.max_score is not None else 10,
+            time_limit=quest.time_limit,
+            is_active=bool(quest.is_active),
+            created_at=quest.created_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CatalogQuest":
+        return cls(
+            **{
+                **data,
+                "quest_type": QuestType(data["quest_type"]),
+                "difficulty": DifficultyLevel(data["difficulty"]),
+                "hints": tuple(data["hints"]) if data["hints"] is not None else None,
+                "created_at": _parse_datetime(data["created_at"]),
+            }
+        )
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _content_version(
+    chapters: tuple[CatalogChapter, ...], quests: tuple[CatalogQuest, ...]
+) -> str:
+    """Digest of the catalog content.
+
+    Every worker that loads the same content computes the same version, so
+    it can be used as a cache key or ETag across processes.
+    """
+    payload = json.dumps(
+        [[astuple(chapter) for chapter in chapters], [astuple(q) for q in quests]],
+        default=_json_default,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+class QuestCatalog:
+    """Immutable, indexed snapshot of all chapters and quests."""
+
+    __slots__ = (
+        "_chapters_by_id",
+        "_quests_by_chapter",
+        "_quests_by_difficulty",
+        "_quests_by_id",
+        "_rendered",
+        "chapters",
+        "version",
+    )
+
+    def __init__(
+        self,
+        chapters: tuple[CatalogChapter, ...] = (),
+        quests: tuple[CatalogQuest, ...] = (),
+    ):
+        chapters = tuple(sorted(chapters, key=lambda c: c.id))
+        quests = tuple(sorted(quests, key=lambda q: q.id))
+
+        active_quests = sorted(
+            (quest for quest in quests if quest.is_active),
+            key=lambda q: (q.order_index, q.id),
+        )
+        quests_by_chapter: dict[int, list[CatalogQuest]] = {}
+        quests_by_difficulty: dict[DifficultyLevel, list[CatalogQuest]] = {}
+        for quest in active_quests:
+            quests_by_chapter.setdefault(quest.chapter_id, []).append(quest)
+            quests_by_difficulty.setdefault(quest.difficulty, []).append(quest)
+
+        values = {
+            "version": _content_version(chapters, quests),
+            "chapters": tuple(
+                sorted(
+                    (chapter for chapter in chapters if chapter.is_active),
+                    key=lambda c: (c.order_index, c.id),
+                )
+            ),
+            "_chapters_by_id": {chapter.id: chapter for chapter in chapters},
+            "_quests_by_id": {quest.id: quest for quest in quests},
+            "_quests_by_chapter": {
+                key: tuple(value) for key, value in quests_by_chapter.items()
+            },
+            "_quests_by_difficulty": {
+                key: tuple(value) for key, value in quests_by_difficulty.items()
+            },
+            "_rendered": {},
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestCatalog is immutable; build a new snapshot")
+
+    def __len__(self) -> int:
+        return len(self._quests_by_id)
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "QuestCatalog":
+        chapters = await chapter_repository.get_all(db)
+        quests = await quest_repository.get_all(db)
+        return cls(
+            tuple(CatalogChapter.from_model(chapter) for chapter in chapters),
+            tuple(CatalogQuest.from_model(quest) for quest in quests),
+        )
+
+    @classmethod
+    def from_json(cls, payload: bytes) -> "QuestCatalog":
+        data = json.loads(payload)
+        return cls(
+            tuple(CatalogChapter.from_dict(chapter) for chapter in data["chapters"]),
+            tuple(CatalogQuest.from_dict(quest) for quest in data["quests"]),
+        )
+
+    def to_json(self) -> bytes:
+        data = {
+            "chapters": [asdict(c) for c in self._chapters_by_id.values()],
+            "quests": [asdict(q) for q in self._quests_by_id.values()],
+        }
+        return json.dumps(data, default=_json_default).encode()
+
+    def get_chapter(self, chapter_id: int) -> CatalogChapter | None:
+        return self._chapters_by_id.get(chapter_id)
+
+    def get_quest(self, quest_id: int) -> CatalogQuest | None:
+        return self._quests_by_id.get(quest_id)
+
+    def get_chapter_quests(self, chapter_id: int) -> tuple[CatalogQuest, ...]:
+        """Active quests of a chapter in play order."""
+        return self._quests_by_chapter.get(chapter_id, ())
+
+    def get_quests_by_difficulty(
+        self, difficulty: DifficultyLevel
+    ) -> tuple[CatalogQuest, ...]:
+        """Active quests of a difficulty in play order."""
+        return self._quests_by_difficulty.get(difficulty, ())
+
+    def rendered(self, name: str, render: Callable[["QuestCatalog"], bytes]) -> bytes:
+        """Serialized response built from this snapshot, rendered once."""
+        payload = self._rendered.get(name)
+        if payload is None:
+            payload = self._rendered[name] = render(self)
+        return payload
@@ -0,0 +1,106 @@
+"""Per-user bitsets of completed quests.
+
+Each user's completed quest ids are kept as a Redis bitmap in which bit
+``quest_id`` is set once the quest is completed, so a recommendation is one
+GET plus a scan of the catalog order instead of loading progress rows.
+
+Bit 0 is never a quest id and marks a bitmap that was fully built from the
+database. Completions only ever set bits, so a build racing with a
+completion cannot lose it: both writes are ORs into the same bitmap, and a
+bitmap created by a completion alone stays unmarked until it is built.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.core.cache import get_redis
+from app.db.repositories.progress import progress_repository
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+LOADED_BIT = 0
+
+
+class CompletedQuests:
+    """Read-only bitset of quest ids."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, bits: bytes = b""):
+        self._bits = bits
+
+    @classmethod
+    def from_ids(cls, quest_ids: Iterable[int]) -> "CompletedQuests":
+        quest_ids = list(quest_ids)
+        bits = bytearray((max(quest_ids, default=0) >> 3) + 1)
+        for quest_id in quest_ids:
+            bits[quest_id >> 3] |= 0x80 >> (quest_id & 7)
+        return cls(bytes(bits))
+
+    def __bytes__(self) -> bytes:
+        return self._bits
+
+    def __contains__(self, quest_id: int) -> bool:
+        index = quest_id >> 3
+        if index >= len(self._bits):
+            return False
+        return bool(self._bits[index] & (0x80 >> (quest_id & 7)))
+
+    @property
+    def is_loaded(self) -> bool:
+        return LOADED_BIT in self
+
+
+class CompletionTracker:
+    def __init__(self):
+        self.progress_repository = progress_repository
+
+    def key(self, user_id: int) -> str:
+        return f"{settings.cache_key_prefix}:completed:{user_id}"
+
+    async def get(self, db: AsyncSession, user_id: int) -> CompletedQuests:
+        if settings.cache_enabled:
+            try:
+                completed = CompletedQuests(
+                    await get_redis().get(self.key(user_id)) or b""
+                )
+                if completed.is_loaded:
+                    return completed
+            except RedisError as e:
+                logger.warning(f"Completion bitmap read failed: {e}")
+
+        quest_ids = await self.progress_repository.get_completed_quest_ids(db, user_id)
+        await self._set_bits(user_id, [LOADED_BIT, *quest_ids])
+        return CompletedQuests.from_ids(quest_ids)
+
+    async def mark_completed(self, user_id: int, quest_id: int) -> None:
+        """Record a committed completion."""
+        await self._set_bits(user_id, [quest_id])
+
+    async def _set_bits(self, user_id: int, offsets: list[int]) -> None:
+        if not settings.cache_enabled:
+            return
+        key = self.key(user_id)
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                for offset in offsets:
+                    pipe.setbit(key, offset, 1)
+                pipe.expire(key, settings.cache_ttl_seconds)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Completion bitmap update failed: {e}")
+            # A cached bitmap missing these bits would hide the completion
+            # until it expires; drop it so the next read reloads it.
+            try:
+                await get_redis().delete(key)
+            except RedisError as e:
+                logger.warning(f"Completion bitmap invalidation failed: {e}")
+
+
+completion_tracker = CompletionTracker()
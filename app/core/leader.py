@@ -0,0 +1,144 @@
+"""Leader election for duties that must run in exactly one process.
+
+Telegram allows a single long-polling consumer per bot, and scheduled jobs
+such as streak reminders must not run once per worker. Each such duty is
+wrapped in run_as_leader: the process that sets the duty's Redis key (with
+a TTL, if nobody else holds it) runs it and renews the key every third of
+the TTL; the rest retry at the same pace. A holder told that the key is no
+longer its own stops the duty at once. One that cannot reach Redis keeps
+the duty running until the TTL it last set has run out, then stops it, and
+another process takes over once the key has expired.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, TypeVar
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.config.settings import get_settings
+from app.core.cache import get_redis
+
+settings = get_settings()
+
+ResultType = TypeVar("ResultType")
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: lock key. ARGV[1]: holder token, ARGV[2]: TTL in ms (0 releases),
+# ARGV[3]: 1 to take the key if nobody holds it.
+# Returns 1 if the caller holds (or held, on release) the lock, 0 otherwise.
+LOCK_SCRIPT = """
+local holder = redis.call("GET", KEYS[1])
+if not holder and ARGV[3] == "1" then
+    redis.call("SET", KEYS[1], ARGV[1], "PX", ARGV[2])
+    return 1
+end
+if holder ~= ARGV[1] then
+    return 0
+end
+if tonumber(ARGV[2]) > 0 then
+    redis.call("PEXPIRE", KEYS[1], ARGV[2])
+else
+    redis.call("DEL", KEYS[1])
+end
+return 1
+"""
+
+
+class LeaderLock:
+    def __init__(self, name: str):
+        self.name = name
+        self.key = f"{settings.leader_lock_key_prefix}:{name}"
+        self.token = uuid.uuid4().hex
+        self._script: tuple[Redis, AsyncScript] | None = None
+
+    @property
+    def ttl_ms(self) -> int:
+        return int(settings.leader_lock_ttl * 1000)
+
+    def _get_script(self) -> AsyncScript:
+        redis = get_redis()
+        if self._script is None or self._script[0] is not redis:
+            self._script = (redis, redis.register_script(LOCK_SCRIPT))
+        return self._script[1]
+
+    async def _call(self, ttl_ms: int, take: bool) -> bool:
+        return bool(
+            await self._get_script()(
+                keys=[self.key], args=[self.token, ttl_ms, int(take)]
+            )
+        )
+
+    async def acquire(self) -> bool:
+        """Take the key if it is free or already ours."""
+        return await self._call(self.ttl_ms, take=True)
+
+    async def renew(self) -> bool:
+        return await self._call(self.ttl_ms, take=False)
+
+    async def release(self) -> bool:
+        return await self._call(0, take=False)
+
+
+async def _holds(
+    lock: LeaderLock, attempt: Callable[[], Awaitable[bool]]
+) -> bool | None:
+    """Result of a lock command, or None if Redis could not be reached."""
+    try:
+        return await attempt()
+    except RedisError as e:
+        logger.warning(f"Leader lock {lock.name} unavailable: {e}")
+        return None
+
+
+async def run_as_leader(
+    name: str, duty: Callable[[], Coroutine[Any, Any, ResultType]]
+) -> ResultType:
+    """Run ``duty`` whenever this process holds the ``name`` lock.
+
+    Returns what the duty returns; a duty that raises releases the lock and
+    the exception propagates.
+    """
+    lock = LeaderLock(name)
+    interval = settings.leader_lock_ttl / 3
+
+    while True:
+        attempted_at = time.monotonic()
+        if not await _holds(lock, lock.acquire):
+            await asyncio.sleep(interval)
+            continue
+
+        logger.info(f"Leading {name}")
+        # The key set at attempted_at cannot expire before this.
+        expires_at = attempted_at + settings.leader_lock_ttl
+        task = asyncio.create_task(duty())
+        try:
+            while True:
+                timeout = min(interval, expires_at - time.monotonic())
+                done, _ = await asyncio.wait({task}, timeout=max(0.0, timeout))
+                if done:
+                    return task.result()
+
+                attempted_at = time.monotonic()
+                held = await _holds(lock, lock.renew)
+                if held:
+                    expires_at = attempted_at + settings.leader_lock_ttl
+                elif held is False:
+                    logger.warning(f"Lost leadership of {name}, stopping it")
+                    break
+                elif time.monotonic() >= expires_at:
+                    logger.warning(f"Leadership of {name} expired, stopping it")
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+            await _holds(lock, lock.release)
@@ -0,0 +1,101 @@
+"""Redis sorted set holding every user's total score.
+
+Totals are only written after the transaction that changed them commits,
+and ZADD GT keeps a late write from lowering a newer total. Reads are
+O(log N); LeaderboardService.rebuild() restores the set from the database.
+"""
+
+import logging
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.core.cache import get_redis
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+PENDING_SCORES_KEY = "leaderboard_pending"
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_scores(session: Session) -> None:
+    session.info.pop(PENDING_SCORES_KEY, None)
+
+
+class Leaderboard:
+    @property
+    def key(self) -> str:
+        return settings.leaderboard_key
+
+    async def record_score(self, user_id: int, total_score: int) -> None:
+        await self._write({user_id: total_score})
+
+    def record_after_commit(
+        self, db: AsyncSession, user_id: int, total_score: int
+    ) -> None:
+        """Remember a new total until the caller's transaction commits."""
+        db.info.setdefault(PENDING_SCORES_KEY, {})[user_id] = total_score
+
+    async def publish_pending(self, db: AsyncSession) -> None:
+        """Write totals recorded with record_after_commit; call after commit."""
+        pending = db.info.pop(PENDING_SCORES_KEY, None)
+        if pending:
+            await self._write(pending)
+
+    async def _write(self, scores: dict[int, int]) -> None:
+        try:
+            await get_redis().zadd(
+                self.key, {str(id): score for id, score in scores.items()}, gt=True
+            )
+        except RedisError as e:
+            logger.warning(f"Leaderboard update failed: {e}")
+
+    async def get_top(self, limit: int) -> list[tuple[int, int]]:
+        """(user_id, score) pairs, highest first. Raises RedisError."""
+        rows = await get_redis().zrevrange(self.key, 0, limit - 1, withscores=True)
+        return [(int(member), int(score)) for member, score in rows]
+
+    async def get_rank(self, user_id: int) -> tuple[int, int] | None:
+        """Return the user's 1-based rank and score, or None if unranked."""
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.zrevrank(self.key, str(user_id))
+                pipe.zscore(self.key, str(user_id))
+                rank, score = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Leaderboard rank lookup failed: {e}")
+            return None
+
+        if rank is None:
+            return None
+        return rank + 1, int(score)
+
+    async def replace(self, batches) -> int:
+        """Swap in a new set built from an async iterable of score batches.
+
+        Scores go to a temporary key first and RENAME swaps it in, so
+        readers never see a half-built leaderboard.
+        """
+        redis = get_redis()
+        tmp_key = f"{self.key}:rebuild"
+        await redis.delete(tmp_key)
+
+        total = 0
+        async for batch in batches:
+            if batch:
+                await redis.zadd(tmp_key, {str(id): s for id, s in batch.items()})
+                total += len(batch)
+
+        if total:
+            await redis.rename(tmp_key, self.key)
+        else:
+            await redis.delete(self.key)
+        return total
+
+
+leaderboard = Leaderboard()
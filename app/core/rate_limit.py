@@ -0,0 +1,141 @@
+"""Token-bucket flood control shared by the bot and the API.
+
+Every hit takes one token from the caller's bucket and one from a global
+bucket of the same limiter; it is allowed only if both have a token left.
+Buckets live in Redis and are checked and updated by one Lua script, so
+all workers share them and concurrent hits cannot overspend. If Redis is
+unavailable, each worker falls back to in-process buckets (the global
+limit then applies per worker).
+"""
+
+import logging
+import math
+import time
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.config.settings import get_settings
+from app.core.cache import TTLCache, get_redis
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# KEYS: bucket keys. ARGV: rate (tokens/s) and burst for each key, in order.
+# Returns 0 when a token was taken from every bucket, otherwise the number
+# of milliseconds until the emptiest bucket has one again.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call("TIME")
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local tokens = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local left = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    left = math.min(burst, left + math.max(0, now - ts) * rate / 1000)
+    if left < 1 then
+        wait = math.max(wait, math.ceil((1 - left) * 1000 / rate))
+    end
+    tokens[i] = left
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    redis.call("HSET", key, "tokens", tokens[i] - 1, "ts", now)
+    redis.call("PEXPIRE", key, math.ceil(burst * 1000 / rate))
+end
+return 0
+"""
+
+
+class LocalBuckets:
+    """In-process token buckets used while Redis is unavailable."""
+
+    def __init__(self, maxsize: int):
+        self._buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            maxsize=maxsize, ttl=3600
+        )
+
+    def take(self, limits: dict[str, tuple[float, int]]) -> float:
+        """Same contract as TOKEN_BUCKET_SCRIPT, in seconds."""
+        now = time.monotonic()
+        tokens = {}
+        wait = 0.0
+        for key, (rate, burst) in limits.items():
+            left, ts = self._buckets.get(key) or (burst, now)
+            left = min(burst, left + (now - ts) * rate)
+            if left < 1:
+                wait = max(wait, (1 - left) / rate)
+            tokens[key] = left
+
+        if wait:
+            return wait
+        for key, (rate, burst) in limits.items():
+            self._buckets.set(
+                key, (tokens[key] - 1, now), expires_at=time.time() + burst / rate
+            )
+        return 0.0
+
+
+class RateLimiter:
+    def __init__(self, name: str):
+        self.name = name
+        self.local = LocalBuckets(maxsize=settings.rate_limit_local_buckets)
+        self._script: tuple[Redis, AsyncScript] | None = None
+
+    def _limits(self, subject: str) -> dict[str, tuple[float, int]]:
+        prefix = f"{settings.rate_limit_key_prefix}:{self.name}"
+        return {
+            f"{prefix}:user:{subject}": (
+                settings.rate_limit_user_rate,
+                settings.rate_limit_user_burst,
+            ),
+            f"{prefix}:global": (
+                settings.rate_limit_global_rate,
+                settings.rate_limit_global_burst,
+            ),
+        }
+
+    def _get_script(self) -> AsyncScript:
+        redis = get_redis()
+        if self._script is None or self._script[0] is not redis:
+            self._script = (redis, redis.register_script(TOKEN_BUCKET_SCRIPT))
+        return self._script[1]
+
+    async def hit(self, subject: str | int) -> float:
+        """Take a token for ``subject``.
+
+        Returns 0 if the hit is allowed, otherwise the seconds to wait.
+        """
+        if not settings.rate_limit_enabled:
+            return 0.0
+        return await self._take(subject)
+
+    async def _take(self, subject: str | int) -> float:
+        limits = self._limits(str(subject))
+        try:
+            wait_ms = await self._get_script()(
+                keys=list(limits),
+                args=[value for limit in limits.values() for value in limit],
+            )
+            return wait_ms / 1000
+        except RedisError as e:
+            logger.warning(f"Rate limiter {self.name} using local buckets: {e}")
+            return self.local.take(limits)
+
+
+def retry_after(wait: float) -> str:
+    """Retry-After header value for a wait in seconds."""
+    return str(max(1, math.ceil(wait)))
+
+
+bot_rate_limiter = RateLimiter("bot")
+api_rate_limiter = RateLimiter("api")
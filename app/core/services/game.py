@@ -1,51 +1,70 @@
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.catalog import CatalogQuest
+from app.core.completions import completion_tracker
+from app.core.leaderboard import leaderboard
 from app.core.services.quest import quest_service
 from app.core.services.user import user_service
-from app.db.models import Quest, User
+from app.db.models import User
 from app.db.repositories.progress import progress_repository
 
+# submit_answer results for input that was not checked as an answer.
+QUEST_NOT_FOUND = "Quest not found"
+QUEST_NOT_STARTED = "Quest not started"
+QUEST_ALREADY_COMPLETED = "Quest already completed"
+
 
 class GameService:
     def __init__(self):
         self.progress_repository = progress_repository
         self.user_service = user_service
         self.quest_service = quest_service
+        self.completion_tracker = completion_tracker
 
-    def start_quest(self, db: Session, user: User, quest_id: int) -> Quest | None:
-        quest = self.quest_service.get_quest_by_id(db, quest_id)
+    async def start_quest(
+        self, db: AsyncSession, user: User, quest_id: int
+    ) -> CatalogQuest | None:
+        quest = await self.quest_service.get_quest_by_id(db, quest_id)
         if not quest:
             return None
 
-        progress = self.progress_repository.get_quest_progress(db, user.id, quest_id)
+        progress = await self.progress_repository.get_quest_progress(
+            db, user.id, quest_id
+        )
         if not progress:
-            self.progress_repository.create_or_update_progress(
+            await self.progress_repository.create_or_update_progress(
                 db, user.id, quest_id, score=0, is_completed=False
             )
 
         return quest
 
-    def submit_answer(
+    async def submit_answer(
         self,
-        db: Session,
+        db: AsyncSession,
         user: User,
         quest_id: int,
         user_input: str,
         time_spent: int | None = None,
         hints_used: int = 0,
     ) -> tuple[bool, int, str]:
-        quest = self.quest_service.get_quest_by_id(db, quest_id)
+        # One transaction: the progress row stays locked until the single commit.
+        quest = await self.quest_service.get_quest_by_id(db, quest_id)
         if not quest:
-            return False, 0, "Quest not found"
+            return False, 0, QUEST_NOT_FOUND
 
-        progress = self.progress_repository.get_quest_progress(db, user.id, quest_id)
+        progress = await self.progress_repository.get_quest_progress(
+            db, user.id, quest_id, for_update=True
+        )
         if not progress:
-            return False, 0, "Quest not started"
+            await db.commit()
+            return False, 0, QUEST_NOT_STARTED
 
         if progress.is_completed:
-            return False, 0, "Quest already completed"
+            await db.commit()
+            return False, 0, QUEST_ALREADY_COMPLETED
 
         is_correct = self.quest_service.validate_vim_command(
             user_input, quest.vim_command or ""
@@ -57,26 +76,35 @@ class GameService:
             quest, is_correct, attempts, hints_used, time_spent
         )
 
-        self.progress_repository.create_or_update_progress(
-            db,
-            user.id,
-            quest_id,
+        self.progress_repository.record_attempt(
+            progress,
             score=score,
             is_completed=is_correct,
             hints_used=hints_used,
             time_spent=time_spent,
         )
+        await db.flush()
 
         if is_correct:
-            self.user_service.update_user_score(db, user.id, score)
+            total_score = await self.user_service.update_user_score(
+                db, user.id, score, commit=False
+            )
+            if total_score is not None:
+                set_committed_value(user, "total_score", total_score)
             message = f"Correct! You earned {score} points."
         else:
             message = "Incorrect. Try again!"
 
+        await db.commit()
+        await leaderboard.publish_pending(db)
+        if is_correct:
+            await self.completion_tracker.mark_completed(user.id, quest_id)
         return is_correct, score, message
 
-    def get_user_progress_summary(self, db: Session, user_id: int) -> dict[str, Any]:
-        progress_list = self.progress_repository.get_user_progress(db, user_id)
+    async def get_user_progress_summary(
+        self, db: AsyncSession, user_id: int
+    ) -> dict[str, Any]:
+        progress_list = await self.progress_repository.get_user_progress(db, user_id)
         completed_quests = [p for p in progress_list if p.is_completed]
 
         total_score = sum(p.score for p in completed_quests)
@@ -95,19 +123,18 @@ class GameService:
             ),
         }
 
-    def get_next_recommended_quest(self, db: Session, user_id: int) -> Quest | None:
-        completed_progress = self.progress_repository.get_completed_quests(db, user_id)
-        completed_quest_ids = {p.quest_id for p in completed_progress}
-
-        beginner_quests = self.quest_service.get_beginner_quests(db)
+    async def get_next_recommended_quest(
+        self, db: AsyncSession, user_id: int
+    ) -> CatalogQuest | None:
+        completed = await self.completion_tracker.get(db, user_id)
 
-        for quest in beginner_quests:
-            if quest.id not in completed_quest_ids:
+        for quest in await self.quest_service.get_beginner_quests(db):
+            if quest.id not in completed:
                 return quest
 
         return None
 
-    def get_quest_hints(self, quest: Quest, hints_used: int) -> str | None:
+    def get_quest_hints(self, quest: CatalogQuest, hints_used: int) -> str | None:
         if not quest.hints or hints_used >= len(quest.hints):
             return None
 
@@ -0,0 +1,72 @@
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.core.leaderboard import leaderboard
+from app.db.repositories.user import user_repository
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardEntry:
+    rank: int
+    user_id: int
+    name: str
+    score: int
+
+
+class LeaderboardService:
+    def __init__(self):
+        self.leaderboard = leaderboard
+        self.user_repository = user_repository
+
+    async def get_top(
+        self, db: AsyncSession, limit: int | None = None
+    ) -> list[LeaderboardEntry]:
+        limit = limit or settings.leaderboard_size
+        try:
+            scores = await self.leaderboard.get_top(limit)
+        except RedisError as e:
+            logger.warning(f"Leaderboard read failed, using database: {e}")
+            scores = await self.user_repository.get_top_scores(db, limit)
+
+        users = await self.user_repository.get_by_ids(db, [id for id, _ in scores])
+        names = {user.id: user.username or user.first_name for user in users}
+
+        return [
+            LeaderboardEntry(rank=rank, user_id=id, name=names[id], score=score)
+            for rank, (id, score) in enumerate(scores, start=1)
+            if id in names
+        ]
+
+    async def get_rank(self, user_id: int) -> tuple[int, int] | None:
+        return await self.leaderboard.get_rank(user_id)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Rebuild the Redis leaderboard from the users table."""
+        total = await self.leaderboard.replace(self._score_batches(db))
+        logger.info(f"Leaderboard rebuilt with {total} users")
+        return total
+
+    async def _score_batches(self, db: AsyncSession) -> AsyncIterator[dict[int, int]]:
+        after_id = 0
+        while True:
+            batch = await self.user_repository.get_score_batch(
+                db, after_id=after_id, limit=REBUILD_BATCH_SIZE
+            )
+            if not batch:
+                return
+            yield {id: score for id, score in batch if score > 0}
+            after_id = batch[-1][0]
+
+
+leaderboard_service = LeaderboardService()
@@ -1,30 +1,77 @@
-from sqlalchemy.orm import Session
+import logging
 
-from app.db.models import Chapter, DifficultyLevel, Quest
-from app.db.repositories.quest import chapter_repository, quest_repository
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import RedisCache, on_invalidate
+from app.core.catalog import CatalogChapter, CatalogQuest, QuestCatalog
+from app.db.models import DifficultyLevel
 
-class QuestService:
-    def __init__(self):
-        self.quest_repository = quest_repository
-        self.chapter_repository = chapter_repository
-
-    def get_available_chapters(self, db: Session) -> list[Chapter]:
-        return self.chapter_repository.get_active_chapters(db)
+logger = logging.getLogger(__name__)
 
-    def get_chapter_quests(self, db: Session, chapter_id: int) -> list[Quest]:
-        return self.quest_repository.get_by_chapter(db, chapter_id)
+CATALOG_NAMESPACE = "catalog"
 
-    def get_quest_by_id(self, db: Session, quest_id: int) -> Quest | None:
-        return self.quest_repository.get(db, quest_id)
 
-    def get_beginner_quests(self, db: Session) -> list[Quest]:
-        return self.quest_repository.get_by_difficulty(db, DifficultyLevel.BEGINNER)
-
-    def get_next_quest_in_chapter(
-        self, db: Session, chapter_id: int, current_order: int
-    ) -> Quest | None:
-        quests = self.get_chapter_quests(db, chapter_id)
+class QuestService:
+    def __init__(self):
+        self.catalog: QuestCatalog | None = None
+        self.cache = RedisCache(CATALOG_NAMESPACE)
+        on_invalidate(CATALOG_NAMESPACE, self.drop_catalog)
+
+    async def load_catalog(self, db: AsyncSession) -> QuestCatalog:
+        """Load the catalog from the shared cache, or from the database."""
+        payload = await self.cache.get("snapshot")
+        if payload is not None:
+            catalog = QuestCatalog.from_json(payload)
+        else:
+            catalog = await QuestCatalog.load(db)
+            await self.cache.set("snapshot", catalog.to_json())
+
+        self.catalog = catalog
+        logger.info(f"Loaded quest catalog {catalog.version} ({len(catalog)} quests)")
+        return catalog
+
+    async def reload_catalog(self, db: AsyncSession) -> QuestCatalog:
+        """Rebuild the catalog from the database after quest content changes.
+
+        The cached snapshot is evicted on every worker, which then loads the
+        new one on its next lookup.
+        """
+        await self.cache.invalidate()
+        return await self.load_catalog(db)
+
+    def drop_catalog(self) -> None:
+        self.catalog = None
+
+    async def get_catalog(self, db: AsyncSession) -> QuestCatalog:
+        catalog = self.catalog
+        if catalog is None:
+            catalog = await self.load_catalog(db)
+        return catalog
+
+    async def get_available_chapters(
+        self, db: AsyncSession
+    ) -> tuple[CatalogChapter, ...]:
+        return (await self.get_catalog(db)).chapters
+
+    async def get_chapter_quests(
+        self, db: AsyncSession, chapter_id: int
+    ) -> tuple[CatalogQuest, ...]:
+        return (await self.get_catalog(db)).get_chapter_quests(chapter_id)
+
+    async def get_quest_by_id(
+        self, db: AsyncSession, quest_id: int
+    ) -> CatalogQuest | None:
+        return (await self.get_catalog(db)).get_quest(quest_id)
+
+    async def get_beginner_quests(self, db: AsyncSession) -> tuple[CatalogQuest, ...]:
+        return (await self.get_catalog(db)).get_quests_by_difficulty(
+            DifficultyLevel.BEGINNER
+        )
+
+    async def get_next_quest_in_chapter(
+        self, db: AsyncSession, chapter_id: int, current_order: int
+    ) -> CatalogQuest | None:
+        quests = await self.get_chapter_quests(db, chapter_id)
         for quest in quests:
             if quest.order_index > current_order:
                 return quest
@@ -59,7 +106,7 @@ class QuestService:
 
     def calculate_quest_score(
         self,
-        quest: Quest,
+        quest: CatalogQuest,
         is_correct: bool,
         attempts: int,
         hints_used: int,
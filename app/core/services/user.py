@@ -1,44 +1,72 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
+from app.core.activity import activity_buffer
+from app.core.cache import TTLCache
 from app.db.models import User
 from app.db.repositories.user import user_repository
 
+settings = get_settings()
+
 
 class UserService:
     def __init__(self):
         self.repository = user_repository
+        # telegram_id -> user id, so a known sender is loaded by primary key.
+        self.user_ids: TTLCache[int, int] = TTLCache(
+            maxsize=settings.user_id_cache_size, ttl=settings.user_id_cache_ttl
+        )
 
-    def get_or_create_user(
+    async def get_or_create_user(
         self,
-        db: Session,
+        db: AsyncSession,
         telegram_id: int,
         username: str | None,
         first_name: str,
         last_name: str | None = None,
     ) -> User:
-        user = self.repository.get_by_telegram_id(db, telegram_id)
+        user = await self.repository.get_by_telegram_id(db, telegram_id)
 
         if not user:
-            user = self.repository.create_from_telegram(
+            user = await self.repository.create_from_telegram(
                 db, telegram_id, username, first_name, last_name
             )
+            self.user_ids.pop(telegram_id)
         else:
             if user.username != username or user.first_name != first_name:
                 user.username = username
                 user.first_name = first_name
                 user.last_name = last_name
-                db.commit()
-                db.refresh(user)
+                await db.commit()
+                await db.refresh(user)
+                self.user_ids.pop(telegram_id)
 
-            self.repository.update_last_activity(db, user.id)
+            activity_buffer.touch(user.id)
 
         return user
 
-    def update_user_score(self, db: Session, user_id: int, score: int) -> User | None:
-        return self.repository.add_score(db, user_id, score)
+    async def update_user_score(
+        self, db: AsyncSession, user_id: int, score: int, *, commit: bool = True
+    ) -> int | None:
+        return await self.repository.add_score(db, user_id, score, commit=commit)
+
+    async def get_user(self, db: AsyncSession, user_id: int) -> User | None:
+        return await self.repository.get(db, user_id)
 
-    def get_user_by_telegram_id(self, db: Session, telegram_id: int) -> User | None:
-        return self.repository.get_by_telegram_id(db, telegram_id)
+    async def get_user_by_telegram_id(
+        self, db: AsyncSession, telegram_id: int
+    ) -> User | None:
+        user_id = self.user_ids.get(telegram_id)
+        if user_id is not None:
+            user = await self.repository.get(db, user_id)
+            if user and user.telegram_id == telegram_id:
+                return user
+            self.user_ids.pop(telegram_id)
+
+        user = await self.repository.get_by_telegram_id(db, telegram_id)
+        if user:
+            self.user_ids.set(telegram_id, user.id)
+        return user
 
     def calculate_level(self, total_score: int) -> int:
         if total_score < 50:
@@ -1,39 +1,180 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+import logging
+import time
+from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.config.settings import get_settings
 from app.db.models import Base
 
 settings = get_settings()
 
-database_url = settings.database_url
-if database_url.startswith("postgresql+asyncpg://"):
-    database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
+logger = logging.getLogger(__name__)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that logs how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_ms = (time.perf_counter() - started) * 1000
+            if wait_ms >= settings.database_pool_slow_checkout_ms:
+                logger.warning(
+                    f"Database pool checkout waited {wait_ms:.1f} ms ({self.status()})"
+                )
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Database pool checkout waited {wait_ms:.1f} ms")
+
+
+def get_async_database_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def get_asyncpg_connect_args() -> dict[str, Any]:
+    if settings.database_pgbouncer:
+        # pgbouncer in transaction mode can hand each transaction a different
+        # server connection, so named prepared statements must not be reused.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+    }
+
+
+def create_postgres_engine(url: str) -> AsyncEngine:
+    connect_args = (
+        get_asyncpg_connect_args()
+        if make_url(url).get_driver_name() == "asyncpg"
+        else {}
+    )
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+def create_sqlite_file_engine(url: str, *, readonly: bool) -> AsyncEngine:
+    """Engine for the single-node SQLite profile.
+
+    The writer engine holds exactly one connection so writes queue up in the
+    process instead of spinning on SQLITE_BUSY; readers run concurrently
+    thanks to the WAL journal.
+    """
+    sqlite_engine = create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.sqlite_reader_pool_size if readonly else 1,
+        max_overflow=0,
+        pool_timeout=settings.database_pool_timeout,
+    )
+
+    @event.listens_for(sqlite_engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        cursor.execute(f"PRAGMA cache_size={settings.sqlite_cache_size}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if readonly:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return sqlite_engine
+
+
+def is_write_clause(clause) -> bool:
+    return isinstance(clause, UpdateBase) or (
+        getattr(clause, "_for_update_arg", None) is not None
+    )
+
+
+database_url = get_async_database_url(settings.database_url)
+url = make_url(database_url)
+read_engine: AsyncEngine | None = None
+replica_engine: AsyncEngine | None = None
 
-if database_url.startswith("sqlite"):
-    engine = create_engine(
+if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+    engine = create_async_engine(
         database_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+elif url.get_backend_name() == "sqlite":
+    engine = create_sqlite_file_engine(database_url, readonly=False)
+    read_engine = create_sqlite_file_engine(database_url, readonly=True)
 else:
-    engine = create_engine(
-        database_url,
-        pool_pre_ping=True,
-        pool_recycle=300,
+    engine = create_postgres_engine(database_url)
+
+if settings.database_replica_url:
+    replica_engine = create_postgres_engine(
+        get_async_database_url(settings.database_replica_url)
     )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class RoutingSession(Session):
+    """Session that picks an engine per statement.
+
+    Flushes, INSERT/UPDATE/DELETE and SELECT ... FOR UPDATE go to the primary,
+    and once a session has touched the primary it stays there so later reads
+    see its own writes. Otherwise repository methods marked ``@read_only`` use
+    the replica, and remaining reads use the SQLite reader pool if there is one.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or self.info.get("use_primary") or is_write_clause(clause):
+            self.info["use_primary"] = True
+            return engine.sync_engine
+        if replica_engine is not None and self.info.get("read_only"):
+            return replica_engine.sync_engine
+        if read_engine is not None:
+            return read_engine.sync_engine
+        return engine.sync_engine
+
+
+async_session_factory = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+async def create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as db:
         yield db
-    finally:
-        db.close()
@@ -7,9 +7,12 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy import (
     Enum as SQLEnum,
@@ -42,6 +45,7 @@ class UserStatus(str, Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_last_activity", "last_activity", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     telegram_id = Column(Integer, unique=True, index=True, nullable=False)
@@ -62,6 +66,14 @@ class User(Base):
 
 class Chapter(Base):
     __tablename__ = "chapters"
+    __table_args__ = (
+        Index(
+            "ix_chapters_active_order",
+            "order_index",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -79,6 +91,21 @@ class Chapter(Base):
 
 class Quest(Base):
     __tablename__ = "quests"
+    __table_args__ = (
+        Index(
+            "ix_quests_chapter_active_order",
+            "chapter_id",
+            "order_index",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+        Index(
+            "ix_quests_difficulty_active_order",
+            "difficulty",
+            "is_active",
+            "order_index",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chapter_id = Column(Integer, ForeignKey("chapters.id"), nullable=False)
@@ -105,6 +132,16 @@ class Quest(Base):
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "quest_id", name="uq_user_progress_user_quest"),
+        Index(
+            "ix_user_progress_user_completed_quest",
+            "user_id",
+            "is_completed",
+            "quest_id",
+        ),
+        Index("ix_user_progress_user_updated", "user_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,86 @@
+"""Per-request SQL statement counting.
+
+Listeners on every Engine add each statement executed inside a
+``track_queries()`` block to the active QueryStats, so a FastAPI request or
+an aiogram update can report how many round-trips it made and how long the
+database took.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: list[str] = field(default_factory=list)
+
+    def add(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.duration_ms += other.duration_ms
+        self.statements.extend(other.statements)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.pop("query_started", None)
+    if stats is None or started is None:
+        return
+
+    stats.count += 1
+    stats.duration_ms += (time.perf_counter() - started) * 1000
+    stats.statements.append(statement)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in this context.
+
+    Nested blocks report their own statements and also add them to the
+    enclosing block when they exit.
+    """
+    stats = QueryStats()
+    parent = _current_stats.get()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.add(stats)
+
+
+def log_query_stats(label: str, stats: QueryStats) -> None:
+    if stats.count >= settings.database_query_count_warning:
+        logger.warning(
+            f"{label} issued {stats.count} SQL statements in {stats.duration_ms:.1f} ms"
+        )
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"{label} issued {stats.count} SQL statements in {stats.duration_ms:.1f} ms"
+        )
@@ -1,35 +1,121 @@
+import base64
+import functools
+import json
+from collections.abc import Awaitable, Callable
+from datetime import datetime
 from typing import Any, Generic, TypeVar
 
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm import Session
 
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
+ResultType = TypeVar("ResultType")
+
+
+def read_only(
+    method: Callable[..., Awaitable[ResultType]],
+) -> Callable[..., Awaitable[ResultType]]:
+    """Mark a repository method as safe to serve from the read replica.
+
+    Only the statements issued inside the method are eligible; a session that
+    has already written keeps reading from the primary.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, db: AsyncSession, *args: Any, **kwargs: Any) -> ResultType:
+        previous = db.info.get("read_only", False)
+        db.info["read_only"] = True
+        try:
+            return await method(self, db, *args, **kwargs)
+        finally:
+            db.info["read_only"] = previous
+
+    return wrapper
+
+
+def encode_cursor(updated_at: datetime, id: int) -> str:
+    payload = json.dumps([updated_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: type[ModelType]):
         self.model = model
 
-    def get(self, db: Session, id: Any) -> ModelType | None:
-        return db.query(self.model).filter(self.model.id == id).first()
+    async def get(self, db: AsyncSession, id: Any) -> ModelType | None:
+        return await db.get(self.model, id)
 
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+    @read_only
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> list[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    @read_only
+    async def get_by_ids(self, db: AsyncSession, ids: list[Any]) -> list[ModelType]:
+        if not ids:
+            return []
+        result = await db.execute(select(self.model).where(self.model.id.in_(ids)))
+        return list(result.scalars().all())
+
+    @read_only
+    async def get_all(self, db: AsyncSession) -> list[ModelType]:
+        result = await db.execute(select(self.model).order_by(self.model.id))
+        return list(result.scalars().all())
+
+    @read_only
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *criteria: Any,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[ModelType], str | None]:
+        """Keyset page over (updated_at, id), newest first.
+
+        Returns the rows and an opaque cursor for the next page, or None when
+        this is the last page. Unlike get_multi the cost does not grow with
+        how deep the client has paged.
+        """
+        key = tuple_(self.model.updated_at, self.model.id)
+        stmt = select(self.model).where(*criteria)
+        if cursor:
+            updated_at, id = decode_cursor(cursor)
+            stmt = stmt.where(key < tuple_(updated_at, id))
+        stmt = stmt.order_by(self.model.updated_at.desc(), self.model.id.desc())
+
+        result = await db.execute(stmt.limit(limit + 1))
+        rows = list(result.scalars().all())
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].updated_at, rows[-1].id)
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else obj_in
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
 
-    def update(
-        self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType
+    async def update(
+        self, db: AsyncSession, *, db_obj: ModelType, obj_in: UpdateSchemaType
     ) -> ModelType:
         obj_data = (
             obj_in.dict(exclude_unset=True) if hasattr(obj_in, "dict") else obj_in
@@ -37,12 +123,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
 
-    def delete(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
-        db.commit()
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
         return obj
@@ -1,43 +1,93 @@
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import UserProgress
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import BaseRepository, read_only
+
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
 
 
 class ProgressRepository(BaseRepository[UserProgress, dict, dict]):
     def __init__(self):
         super().__init__(UserProgress)
 
-    def get_user_progress(self, db: Session, user_id: int) -> list[UserProgress]:
-        return db.query(UserProgress).filter(UserProgress.user_id == user_id).all()
+    @read_only
+    async def get_user_progress(
+        self, db: AsyncSession, user_id: int
+    ) -> list[UserProgress]:
+        result = await db.execute(
+            select(UserProgress).where(UserProgress.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_progress_page(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        completed_only: bool = False,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[UserProgress], str | None]:
+        criteria = [UserProgress.user_id == user_id]
+        if completed_only:
+            criteria.append(UserProgress.is_completed.is_(True))
+        return await self.get_page(db, *criteria, limit=limit, cursor=cursor)
 
-    def get_quest_progress(
-        self, db: Session, user_id: int, quest_id: int
+    async def get_quest_progress(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        quest_id: int,
+        *,
+        for_update: bool = False,
     ) -> UserProgress | None:
-        return (
-            db.query(UserProgress)
-            .filter(
+        stmt = (
+            select(UserProgress)
+            .where(
                 UserProgress.user_id == user_id,
                 UserProgress.quest_id == quest_id,
             )
-            .first()
+            .limit(1)
         )
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await db.execute(stmt)
+        return result.scalars().first()
 
-    def get_completed_quests(self, db: Session, user_id: int) -> list[UserProgress]:
-        return (
-            db.query(UserProgress)
-            .filter(
+    @read_only
+    async def get_completed_quests(
+        self, db: AsyncSession, user_id: int
+    ) -> list[UserProgress]:
+        result = await db.execute(
+            select(UserProgress).where(
                 UserProgress.user_id == user_id,
                 UserProgress.is_completed == True,
             )
-            .all()
         )
+        return list(result.scalars().all())
 
-    def create_or_update_progress(
+    @read_only
+    async def get_completed_quest_ids(
+        self, db: AsyncSession, user_id: int
+    ) -> list[int]:
+        result = await db.execute(
+            select(UserProgress.quest_id).where(
+                UserProgress.user_id == user_id,
+                UserProgress.is_completed.is_(True),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def create_or_update_progress(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: int,
         quest_id: int,
         score: int = 0,
@@ -45,20 +95,86 @@ class ProgressRepository(BaseRepository[UserProgress, dict, dict]):
         hints_used: int = 0,
         time_spent: int | None = None,
     ) -> UserProgress:
-        progress = self.get_quest_progress(db, user_id, quest_id)
+        dialect = db.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            return await self._read_modify_write_progress(
+                db, user_id, quest_id, score, is_completed, hints_used, time_spent
+            )
+
+        progress = await db.scalar(
+            self._upsert_statement(
+                dialect, user_id, quest_id, score, is_completed, hints_used, time_spent
+            ),
+            execution_options={"populate_existing": True},
+        )
+        await db.commit()
+        return progress
+
+    def _upsert_statement(
+        self,
+        dialect: str,
+        user_id: int,
+        quest_id: int,
+        score: int,
+        is_completed: bool,
+        hints_used: int,
+        time_spent: int | None,
+    ):
+        now = datetime.utcnow()
+        greatest = func.greatest if dialect == "postgresql" else func.max
+
+        stmt = UPSERT_INSERTS[dialect](UserProgress).values(
+            user_id=user_id,
+            quest_id=quest_id,
+            score=score,
+            attempts=1,
+            hints_used=hints_used,
+            is_completed=is_completed,
+            time_spent=time_spent,
+            completed_at=now if is_completed else None,
+            created_at=now,
+            updated_at=now,
+        )
+        excluded = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=[UserProgress.user_id, UserProgress.quest_id],
+            set_={
+                "attempts": UserProgress.attempts + 1,
+                "score": greatest(UserProgress.score, excluded.score),
+                "hints_used": greatest(UserProgress.hints_used, excluded.hints_used),
+                "is_completed": or_(UserProgress.is_completed, excluded.is_completed),
+                "completed_at": func.coalesce(
+                    UserProgress.completed_at, excluded.completed_at
+                ),
+                "time_spent": func.coalesce(
+                    excluded.time_spent, UserProgress.time_spent
+                ),
+                "updated_at": excluded.updated_at,
+            },
+        ).returning(UserProgress)
+
+    async def _read_modify_write_progress(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        quest_id: int,
+        score: int,
+        is_completed: bool,
+        hints_used: int,
+        time_spent: int | None,
+    ) -> UserProgress:
+        progress = await self.get_quest_progress(db, user_id, quest_id)
 
         if progress:
-            progress.attempts += 1
-            progress.score = max(progress.score, score)
-            progress.hints_used = max(progress.hints_used, hints_used)
-            if is_completed and not progress.is_completed:
-                progress.is_completed = True
-                progress.completed_at = datetime.utcnow()
-            if time_spent:
-                progress.time_spent = time_spent
-            progress.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(progress)
+            self.record_attempt(
+                progress,
+                score=score,
+                is_completed=is_completed,
+                hints_used=hints_used,
+                time_spent=time_spent,
+            )
+            await db.commit()
+            await db.refresh(progress)
         else:
             progress_data = {
                 "user_id": user_id,
@@ -72,8 +188,30 @@ class ProgressRepository(BaseRepository[UserProgress, dict, dict]):
             if is_completed:
                 progress_data["completed_at"] = datetime.utcnow()
 
-            progress = self.create(db, obj_in=progress_data)
+            progress = await self.create(db, obj_in=progress_data)
+
+        return progress
 
+    def record_attempt(
+        self,
+        progress: UserProgress,
+        *,
+        score: int,
+        is_completed: bool,
+        hints_used: int,
+        time_spent: int | None = None,
+    ) -> UserProgress:
+        """Apply one attempt to a loaded row; the caller owns the transaction."""
+        now = datetime.utcnow()
+        progress.attempts += 1
+        progress.score = max(progress.score, score)
+        progress.hints_used = max(progress.hints_used, hints_used)
+        if is_completed and not progress.is_completed:
+            progress.is_completed = True
+            progress.completed_at = now
+        if time_spent:
+            progress.time_spent = time_spent
+        progress.updated_at = now
         return progress
 
 
@@ -1,59 +1,65 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Chapter, DifficultyLevel, Quest, QuestType
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import BaseRepository, read_only
 
 
 class QuestRepository(BaseRepository[Quest, dict, dict]):
     def __init__(self):
         super().__init__(Quest)
 
-    def get_by_chapter(self, db: Session, chapter_id: int) -> list[Quest]:
-        return (
-            db.query(Quest)
-            .filter(Quest.chapter_id == chapter_id, Quest.is_active == True)
+    @read_only
+    async def get_by_chapter(self, db: AsyncSession, chapter_id: int) -> list[Quest]:
+        result = await db.execute(
+            select(Quest)
+            .where(Quest.chapter_id == chapter_id, Quest.is_active == True)
             .order_by(Quest.order_index)
-            .all()
         )
+        return list(result.scalars().all())
 
-    def get_by_type(self, db: Session, quest_type: QuestType) -> list[Quest]:
-        return (
-            db.query(Quest)
-            .filter(Quest.quest_type == quest_type, Quest.is_active == True)
-            .all()
+    @read_only
+    async def get_by_type(self, db: AsyncSession, quest_type: QuestType) -> list[Quest]:
+        result = await db.execute(
+            select(Quest).where(Quest.quest_type == quest_type, Quest.is_active == True)
         )
+        return list(result.scalars().all())
 
-    def get_by_difficulty(
-        self, db: Session, difficulty: DifficultyLevel
+    @read_only
+    async def get_by_difficulty(
+        self, db: AsyncSession, difficulty: DifficultyLevel
     ) -> list[Quest]:
-        return (
-            db.query(Quest)
-            .filter(Quest.difficulty == difficulty, Quest.is_active == True)
-            .all()
+        result = await db.execute(
+            select(Quest)
+            .where(Quest.difficulty == difficulty, Quest.is_active == True)
+            .order_by(Quest.order_index)
         )
+        return list(result.scalars().all())
 
 
 class ChapterRepository(BaseRepository[Chapter, dict, dict]):
     def __init__(self):
         super().__init__(Chapter)
 
-    def get_active_chapters(self, db: Session) -> list[Chapter]:
-        return (
-            db.query(Chapter)
-            .filter(Chapter.is_active == True)
+    @read_only
+    async def get_active_chapters(self, db: AsyncSession) -> list[Chapter]:
+        result = await db.execute(
+            select(Chapter)
+            .where(Chapter.is_active == True)
             .order_by(Chapter.order_index)
-            .all()
         )
+        return list(result.scalars().all())
 
-    def get_by_difficulty(
-        self, db: Session, difficulty: DifficultyLevel
+    @read_only
+    async def get_by_difficulty(
+        self, db: AsyncSession, difficulty: DifficultyLevel
     ) -> list[Chapter]:
-        return (
-            db.query(Chapter)
-            .filter(Chapter.difficulty == difficulty, Chapter.is_active == True)
+        result = await db.execute(
+            select(Chapter)
+            .where(Chapter.difficulty == difficulty, Chapter.is_active == True)
             .order_by(Chapter.order_index)
-            .all()
         )
+        return list(result.scalars().all())
 
 
 quest_repository = QuestRepository()
@@ -1,21 +1,29 @@
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import case, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import User
-from app.db.repositories.base import BaseRepository
+from app.core.leaderboard import leaderboard
+from app.db.models import User, UserStatus
+from app.db.repositories.base import BaseRepository, read_only
+
+# Keeps each UPDATE well under the bind parameter limits (3 per user).
+ACTIVITY_BATCH_SIZE = 1000
 
 
 class UserRepository(BaseRepository[User, dict, dict]):
     def __init__(self):
         super().__init__(User)
 
-    def get_by_telegram_id(self, db: Session, telegram_id: int) -> User | None:
-        return db.query(User).filter(User.telegram_id == telegram_id).first()
+    async def get_by_telegram_id(
+        self, db: AsyncSession, telegram_id: int
+    ) -> User | None:
+        result = await db.execute(select(User).where(User.telegram_id == telegram_id))
+        return result.scalars().first()
 
-    def create_from_telegram(
+    async def create_from_telegram(
         self,
-        db: Session,
+        db: AsyncSession,
         telegram_id: int,
         username: str,
         first_name: str,
@@ -27,23 +35,113 @@ class UserRepository(BaseRepository[User, dict, dict]):
             "first_name": first_name,
             "last_name": last_name,
         }
-        return self.create(db, obj_in=user_data)
-
-    def update_last_activity(self, db: Session, user_id: int) -> User | None:
-        user = self.get(db, user_id)
-        if user:
-            user.last_activity = datetime.utcnow()
-            db.commit()
-            db.refresh(user)
-        return user
-
-    def add_score(self, db: Session, user_id: int, score: int) -> User | None:
-        user = self.get(db, user_id)
-        if user:
-            user.total_score += score
-            db.commit()
-            db.refresh(user)
-        return user
+        return await self.create(db, obj_in=user_data)
+
+    async def update_last_activity_bulk(
+        self, db: AsyncSession, activity: dict[int, datetime]
+    ) -> int:
+        """Set last_activity for many users with one UPDATE per batch.
+
+        The new value is picked per row with CASE id ... END. A timestamp
+        never moves backwards, so a late flush cannot overwrite newer
+        activity written by another worker.
+        """
+        updated = 0
+        items = list(activity.items())
+        for start in range(0, len(items), ACTIVITY_BATCH_SIZE):
+            batch = dict(items[start : start + ACTIVITY_BATCH_SIZE])
+            new_activity = case(batch, value=User.id)
+            result = await db.execute(
+                update(User)
+                .where(User.id.in_(batch))
+                .where(
+                    or_(
+                        User.last_activity.is_(None),
+                        User.last_activity < new_activity,
+                    )
+                )
+                .values(last_activity=new_activity)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        await db.commit()
+        return updated
+
+    async def add_score(
+        self, db: AsyncSession, user_id: int, score: int, *, commit: bool = True
+    ) -> int | None:
+        """Atomically add to total_score and return the new total.
+
+        The Redis leaderboard follows once the new total is committed; with
+        ``commit=False`` the caller must run leaderboard.publish_pending()
+        after its own commit.
+        """
+        total_score = await db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(total_score=User.total_score + score)
+            .returning(User.total_score),
+            execution_options={"synchronize_session": False},
+        )
+        if total_score is None:
+            return None
+        if commit:
+            await db.commit()
+            await leaderboard.record_score(user_id, total_score)
+        else:
+            leaderboard.record_after_commit(db, user_id, total_score)
+        return total_score
+
+    @read_only
+    async def get_top_scores(
+        self, db: AsyncSession, limit: int
+    ) -> list[tuple[int, int]]:
+        result = await db.execute(
+            select(User.id, User.total_score)
+            .where(User.total_score > 0)
+            .order_by(User.total_score.desc(), User.id)
+            .limit(limit)
+        )
+        return [(id, total_score) for id, total_score in result]
+
+    @read_only
+    async def get_score_batch(
+        self, db: AsyncSession, *, after_id: int, limit: int
+    ) -> list[tuple[int, int]]:
+        """(id, total_score) for the next ``limit`` users with id > after_id."""
+        result = await db.execute(
+            select(User.id, User.total_score)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return [(id, total_score or 0) for id, total_score in result]
+
+    @read_only
+    async def get_idle_batch(
+        self,
+        db: AsyncSession,
+        *,
+        after: tuple[datetime, int],
+        until: datetime,
+        limit: int,
+    ) -> list[tuple[int, int, datetime]]:
+        """(id, telegram_id, last_activity) of active users idle since ``until``.
+
+        Keyset scan over (last_activity, id) starting after ``after``, served
+        by ix_users_last_activity.
+        """
+        result = await db.execute(
+            select(User.id, User.telegram_id, User.last_activity)
+            .where(
+                tuple_(User.last_activity, User.id) > tuple_(*after),
+                User.last_activity <= until,
+                User.status == UserStatus.ACTIVE,
+            )
+            .order_by(User.last_activity, User.id)
+            .limit(limit)
+        )
+        return [(id, telegram_id, at) for id, telegram_id, at in result]
 
 
 user_repository = UserRepository()
@@ -1,5 +1,6 @@
 """Main application entry point for VimMaster."""
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -9,12 +10,34 @@ from contextlib import asynccontextmanager
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from fastapi import FastAPI
-
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from aiogram.types import Update
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.api.auth import decode_access_token
 from app.api.main import api_router
 from app.bot.handlers import menu, quest, start
-from app.config.database import close_database, init_database
+from app.bot.middlewares import (
+    DatabaseSessionMiddleware,
+    QueryStatsMiddleware,
+    RateLimitMiddleware,
+    UserMiddleware,
+)
+from app.bot.reminders import streak_reminders
+from app.bot.send_queue import send_queue
+from app.bot.webhook import SECRET_TOKEN_HEADER, UpdateFeeder, check_secret_token
+from app.config.database import close_database, get_session, init_database
 from app.config.settings import settings
+from app.core.activity import activity_buffer
+from app.core.cache import close_redis, get_redis, listen_for_invalidations
+from app.core.leader import run_as_leader
+from app.core.rate_limit import api_rate_limiter, retry_after
+from app.core.services.quest import quest_service
+from app.db.base import async_session_factory
+from app.db.query_stats import log_query_stats, track_queries
 
 # Configure logging
 logging.basicConfig(
@@ -27,9 +50,27 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+def create_fsm_storage() -> BaseStorage:
+    """FSM storage shared by all bot workers (in-process for development)."""
+    if settings.fsm_storage == "memory":
+        return MemoryStorage()
+    return RedisStorage(
+        get_redis(),
+        key_builder=DefaultKeyBuilder(prefix=settings.fsm_key_prefix),
+        state_ttl=settings.fsm_state_ttl,
+        data_ttl=settings.fsm_state_ttl,
+    )
+
+
 # Initialize bot and dispatcher (will be created when needed)
 bot = None
-dp = Dispatcher()
+dp = Dispatcher(storage=create_fsm_storage())
+update_feeder = UpdateFeeder(
+    dp,
+    max_concurrency=settings.webhook_max_concurrency,
+    max_pending=settings.webhook_max_pending,
+)
 
 
 def get_bot() -> Bot:
@@ -43,11 +84,18 @@ def get_bot() -> Bot:
             token=settings.telegram_bot_token,
             default=DefaultBotProperties(parse_mode=ParseMode.HTML),
         )
+        bot.session.middleware(send_queue)
     return bot
 
 
 def setup_bot() -> None:
     """Setup bot with handlers and middlewares."""
+    dp.update.outer_middleware(RateLimitMiddleware())
+    dp.update.outer_middleware(QueryStatsMiddleware())
+    dp.update.outer_middleware(DatabaseSessionMiddleware(async_session_factory))
+    dp.message.middleware(UserMiddleware())
+    dp.callback_query.middleware(UserMiddleware())
+
     # Register routers
     dp.include_router(start.router)
     dp.include_router(menu.router)
@@ -56,6 +104,68 @@ def setup_bot() -> None:
     logger.info("Bot handlers registered successfully")
 
 
+async def load_quest_catalog() -> None:
+    """Load the quest catalog snapshot before serving traffic."""
+    async with get_session() as db:
+        await quest_service.load_catalog(db)
+
+
+def start_cache_listener() -> asyncio.Task | None:
+    """Follow cache invalidations published by other workers."""
+    if not settings.cache_enabled:
+        return None
+    return asyncio.create_task(listen_for_invalidations())
+
+
+def has_role(role: str) -> bool:
+    """Whether this process takes on ``role`` (PROCESS_ROLE=all takes all)."""
+    return settings.process_role in (role, "all")
+
+
+async def start_duties() -> list[asyncio.Task]:
+    """Start the bot and worker duties of this process's role.
+
+    Polling and scheduled jobs run under a leader lock, so each runs in one
+    process however many share the role. Webhook updates are handled by
+    every bot process.
+    """
+    duties: list[asyncio.Task] = []
+    if not settings.telegram_bot_token:
+        if has_role("bot") or has_role("worker"):
+            logger.warning("No Telegram bot token provided, bot will not start")
+        return duties
+
+    if has_role("bot"):
+        if settings.telegram_webhook_url:
+            await start_bot_webhook()
+            logger.info("Bot webhook set")
+        else:
+            duties.append(
+                asyncio.create_task(run_as_leader("polling", start_bot_polling))
+            )
+            logger.info("Bot polling scheduled")
+
+    if has_role("worker") and settings.streak_reminders_enabled:
+        current_bot = get_bot()
+        duties.append(
+            asyncio.create_task(
+                run_as_leader(
+                    "streak_reminders", lambda: streak_reminders.run(current_bot)
+                )
+            )
+        )
+    return duties
+
+
+async def stop_task(task: asyncio.Task | None) -> None:
+    if task and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """FastAPI lifespan context manager."""
@@ -64,38 +174,46 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Initialize database
     await init_database()
+    await load_quest_catalog()
+    cache_listener_task = start_cache_listener()
+    activity_task = asyncio.create_task(activity_buffer.run())
 
     # Setup bot
     setup_bot()
-
-    # Start bot polling in background
-    if settings.telegram_bot_token:
-        bot_task = asyncio.create_task(start_bot_polling())
-        logger.info("Bot polling started")
-    else:
-        logger.warning("No Telegram bot token provided, bot will not start")
-        bot_task = None
+    duties = await start_duties()
 
     yield
 
     # Shutdown
     logger.info("Shutting down VimMaster application...")
 
-    # Stop bot
-    if bot_task and not bot_task.done():
-        bot_task.cancel()
-        try:
-            await bot_task
-        except asyncio.CancelledError:
-            pass
-        logger.info("Bot polling stopped")
+    # Stop bot and jobs
+    for task in duties:
+        await stop_task(task)
+    await update_feeder.drain(settings.webhook_drain_timeout)
+
+    await stop_task(cache_listener_task)
+    await stop_task(activity_task)
+    await close_redis()
 
     # Close database connections
     await close_database()
 
     # Close bot session
-    current_bot = get_bot()
-    await current_bot.session.close()
+    if bot:
+        await bot.session.close()
+
+
+async def start_bot_webhook() -> None:
+    """Point Telegram at this deployment's webhook route."""
+    if not settings.telegram_webhook_secret_token:
+        raise ValueError("TELEGRAM_WEBHOOK_SECRET_TOKEN is required for webhooks")
+
+    await get_bot().set_webhook(
+        url=settings.telegram_webhook_url,
+        secret_token=settings.telegram_webhook_secret_token,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
 
 
 async def start_bot_polling() -> None:
@@ -119,7 +237,67 @@ app = FastAPI(
 )
 
 # Include API routes
-app.include_router(api_router, prefix="/api/v1")
+if has_role("api"):
+    app.include_router(api_router, prefix="/api/v1")
+
+
+@app.middleware("http")
+async def log_request_queries(request: Request, call_next) -> Response:
+    """Log how many SQL statements each request issued."""
+    with track_queries() as stats:
+        try:
+            return await call_next(request)
+        finally:
+            log_query_stats(f"{request.method} {request.url.path}", stats)
+
+
+def rate_limit_subject(request: Request) -> str:
+    """Bucket of a request: its token's user, else the client address."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{decode_access_token(token)}"
+        except HTTPException:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+@app.middleware("http")
+async def rate_limit_requests(request: Request, call_next) -> Response:
+    """Reject API requests over their token bucket before any DB work."""
+    if not request.url.path.startswith("/api/"):
+        return await call_next(request)
+
+    wait = await api_rate_limiter.hit(rate_limit_subject(request))
+    if wait:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests"},
+            headers={"Retry-After": retry_after(wait)},
+        )
+    return await call_next(request)
+
+
+@app.post(settings.telegram_webhook_path, include_in_schema=False)
+async def telegram_webhook(request: Request) -> Response:
+    """Accept an update from Telegram and process it in the background."""
+    if not settings.telegram_webhook_url or not has_role("bot"):
+        return Response(status_code=404)
+    if not check_secret_token(request.headers.get(SECRET_TOKEN_HEADER)):
+        return Response(status_code=401)
+
+    current_bot = get_bot()
+    try:
+        update = Update.model_validate(
+            await request.json(), context={"bot": current_bot}
+        )
+    except ValueError:
+        return Response(status_code=400)
+
+    if not update_feeder.submit(current_bot, update):
+        # Telegram redelivers the update once the backlog has drained.
+        return Response(status_code=503)
+    return Response(status_code=200)
 
 
 @app.get("/")
@@ -140,29 +318,42 @@ async def health_check() -> dict:
         "status": "healthy",
         "database": "connected",  # TODO: Add actual database health check
         "bot": "running" if settings.telegram_bot_token else "not configured",
+        "role": settings.process_role,
+        "send_queue": send_queue.stats(),
     }
 
 
 async def main() -> None:
-    """Main function for running bot only (without FastAPI)."""
+    """Run the bot and worker duties of PROCESS_ROLE (without FastAPI)."""
     if not settings.telegram_bot_token:
         logger.error("TELEGRAM_BOT_TOKEN is not set!")
         sys.exit(1)
+    if settings.process_role == "api" or (
+        has_role("bot") and settings.telegram_webhook_url
+    ):
+        logger.error("This role needs the HTTP server: uvicorn app.main:app")
+        sys.exit(1)
 
-    logger.info("Starting VimMaster bot...")
+    logger.info(f"Starting VimMaster {settings.process_role} process...")
 
     # Initialize database
     await init_database()
+    await load_quest_catalog()
+    cache_listener_task = start_cache_listener()
+    activity_task = asyncio.create_task(activity_buffer.run())
 
     # Setup bot
     setup_bot()
+    duties = await start_duties()
 
     try:
-        # Start polling
-        current_bot = get_bot()
-        await dp.start_polling(
-            current_bot, allowed_updates=dp.resolve_used_update_types()
-        )
+        # Run until polling stops or a duty fails
+        if duties:
+            done, _ = await asyncio.wait(duties, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        else:
+            logger.warning("Nothing to run for this role")
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
@@ -170,11 +361,24 @@ async def main() -> None:
         sys.exit(1)
     finally:
         # Cleanup
+        for task in duties:
+            await stop_task(task)
+        await stop_task(cache_listener_task)
+        await stop_task(activity_task)
+        await close_redis()
         await close_database()
         if bot:
             await bot.session.close()
 
 
 if __name__ == "__main__":
-    # Run bot only (without FastAPI)
+    # Run bot and worker duties only (without FastAPI)
+    parser = argparse.ArgumentParser(description="VimMaster bot and worker")
+    parser.add_argument(
+        "--role",
+        choices=["bot", "worker", "all"],
+        default=settings.process_role,
+        help="duties to run (default: PROCESS_ROLE)",
+    )
+    settings.process_role = parser.parse_args().role
     asyncio.run(main())
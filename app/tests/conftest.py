@@ -1,11 +1,15 @@
 """Pytest configuration and fixtures for VimMaster tests."""
 
 import asyncio
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Generator, Iterator
+from contextlib import contextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Chat, Message, User
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
@@ -14,6 +18,7 @@ from sqlalchemy.pool import StaticPool
 
 from app.config.database import Base
 from app.config.settings import Settings
+from app.db.query_stats import QueryStats, track_queries
 
 # Import app only when needed to avoid bot initialization issues
 
@@ -58,6 +63,57 @@ async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+@pytest.fixture(autouse=True)
+def disable_shared_cache(monkeypatch):
+    """Keep tests independent of whatever a local Redis has cached."""
+    from app.config.settings import settings
+
+    monkeypatch.setattr(settings, "cache_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limits(monkeypatch):
+    """Let tests call handlers and endpoints without being throttled."""
+    from app.config.settings import settings
+
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    monkeypatch.setattr(settings, "send_pacing_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def reset_quest_catalog():
+    """Drop the quest catalog snapshot so each test loads its own content."""
+    from app.core.services.quest import quest_service
+
+    yield
+    quest_service.catalog = None
+
+
+@pytest.fixture(autouse=True)
+def reset_user_ids():
+    """Forget senders resolved against another test's database."""
+    from app.core.services.user import user_service
+
+    yield
+    user_service.user_ids.clear()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Fail when the wrapped block issues more than ``limit`` SQL statements."""
+
+    @contextmanager
+    def _assert_max_queries(limit: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"Expected at most {limit} SQL statements, got {stats.count}:\n"
+            + "\n".join(stats.statements)
+        )
+
+    return _assert_max_queries
+
+
 # Bot fixtures
 @pytest.fixture
 def mock_bot() -> Bot:
@@ -138,6 +194,15 @@ def mock_redis():
     return redis_mock
 
 
+@pytest.fixture
+def fsm_state() -> FSMContext:
+    """FSM context of the default test chat, kept in memory."""
+    return FSMContext(
+        storage=MemoryStorage(),
+        key=StorageKey(bot_id=1, chat_id=12345, user_id=12345),
+    )
+
+
 # Event loop fixture for async tests
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
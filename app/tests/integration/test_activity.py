@@ -0,0 +1,155 @@
+"""Integration tests for the buffered last_activity updates."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.core import activity as activity_module
+from app.core.activity import ActivityBuffer
+from app.db.models import User
+from app.db.repositories.user import user_repository
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+async def users(test_session):
+    """Persist two users last seen an hour ago."""
+    users = [
+        User(telegram_id=1, first_name="Alice", last_activity=NOW - timedelta(hours=1)),
+        User(telegram_id=2, first_name="Bob", last_activity=NOW - timedelta(hours=1)),
+    ]
+    test_session.add_all(users)
+    await test_session.commit()
+    return users
+
+
+@pytest.fixture
+def session_factory(test_session):
+    """Make the buffer flush through the test session."""
+
+    @asynccontextmanager
+    async def get_session():
+        yield test_session
+
+    with patch.object(activity_module, "get_session", get_session):
+        yield
+
+
+async def last_activity(test_session, user: User) -> datetime:
+    await test_session.refresh(user)
+    return user.last_activity
+
+
+class TestBulkUpdate:
+    """Test update_last_activity_bulk."""
+
+    @pytest.mark.asyncio
+    async def test_updates_all_users_in_one_statement(
+        self, test_session, users, assert_max_queries
+    ):
+        """Test every buffered user is written by a single UPDATE."""
+        alice, bob = users
+
+        with assert_max_queries(1):
+            updated = await user_repository.update_last_activity_bulk(
+                test_session, {alice.id: NOW, bob.id: NOW}
+            )
+
+        assert updated == 2
+        assert await last_activity(test_session, alice) == NOW
+        assert await last_activity(test_session, bob) == NOW
+
+    @pytest.mark.asyncio
+    async def test_never_moves_backwards(self, test_session, users):
+        """Test an older timestamp does not overwrite newer activity."""
+        alice, _ = users
+
+        updated = await user_repository.update_last_activity_bulk(
+            test_session, {alice.id: NOW - timedelta(days=1)}
+        )
+
+        assert updated == 0
+        assert await last_activity(test_session, alice) == NOW - timedelta(hours=1)
+
+
+class TestActivityBuffer:
+    """Test ActivityBuffer collects touches and flushes them."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_latest_touch(
+        self, test_session, users, session_factory
+    ):
+        """Test repeated touches collapse into the latest timestamp."""
+        alice, _ = users
+        buffer = ActivityBuffer()
+        buffer.touch(alice.id, NOW - timedelta(minutes=5))
+        buffer.touch(alice.id, NOW)
+
+        assert await buffer.flush() == 1
+        assert len(buffer) == 0
+        assert await last_activity(test_session, alice) == NOW
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_touches(self, users, session_factory):
+        """Test a failed write is retried on the next flush."""
+        alice, _ = users
+        buffer = ActivityBuffer()
+        buffer.touch(alice.id, NOW)
+
+        with (
+            patch.object(
+                buffer.user_repository,
+                "update_last_activity_bulk",
+                side_effect=RuntimeError("database down"),
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await buffer.flush()
+
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_is_written_on_shutdown(
+        self, test_session, users, session_factory, monkeypatch
+    ):
+        """Test stopping the task mid-write still persists the batch."""
+        monkeypatch.setattr(activity_module.settings, "activity_flush_interval", 0)
+        alice, _ = users
+        buffer = ActivityBuffer()
+        buffer.touch(alice.id, NOW)
+        write = buffer.user_repository.update_last_activity_bulk
+        writing = asyncio.Event()
+
+        async def stall_first_write(db, last_activity):
+            if not writing.is_set():
+                writing.set()
+                await asyncio.sleep(60)
+            return await write(db, last_activity)
+
+        with patch.object(
+            buffer.user_repository, "update_last_activity_bulk", stall_first_write
+        ):
+            task = asyncio.create_task(buffer.run())
+            await writing.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert len(buffer) == 0
+        assert await last_activity(test_session, alice) == NOW
+
+    def test_full_buffer_requests_early_flush(self, monkeypatch):
+        """Test reaching activity_buffer_size wakes the flush task."""
+        monkeypatch.setattr(activity_module.settings, "activity_buffer_size", 2)
+        buffer = ActivityBuffer()
+
+        buffer.touch(1)
+        assert not buffer._full.is_set()
+        buffer.touch(2)
+        assert buffer._full.is_set()
@@ -52,7 +52,7 @@ class TestStartHandler:
         message.from_user = None
 
         # Should return early without calling answer
-        await start_handler(message)
+        await start_handler(message, MagicMock())
         assert not hasattr(message, "answer") or not message.answer.called
 
     @pytest.mark.asyncio
@@ -80,7 +80,7 @@ class TestStartHandler:
         )
         message.answer = AsyncMock()
 
-        await profile_handler(message)
+        await profile_handler(message, MagicMock(), None)
 
         message.answer.assert_called_once()
         call_args = message.answer.call_args
@@ -98,7 +98,7 @@ class TestStartHandler:
         message = MagicMock(spec=Message)
         message.from_user = None
 
-        await profile_handler(message)
+        await profile_handler(message, MagicMock(), None)
         assert not hasattr(message, "answer") or not message.answer.called
 
 
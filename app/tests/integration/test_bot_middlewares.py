@@ -0,0 +1,180 @@
+"""Integration tests for the per-update session and user middlewares."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import SendMessage
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bot.middlewares import DatabaseSessionMiddleware, UserMiddleware
+from app.bot.send_queue import SendQueue
+from app.core.services.user import user_service
+from app.db.models import User
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return async_sessionmaker(test_engine, expire_on_commit=False)
+
+
+async def count_users(session_factory) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(func.count(User.id)))
+
+
+class TestDatabaseSessionMiddleware:
+    """Test one session is opened, committed or rolled back per update."""
+
+    @pytest.mark.asyncio
+    async def test_commits_after_handler(self, session_factory):
+        """Test changes made by a handler are committed."""
+
+        async def handler(event, data):
+            data["db"].add(User(telegram_id=1, first_name="Test"))
+
+        await DatabaseSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        assert await count_users(session_factory) == 1
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_on_error(self, session_factory):
+        """Test a failing handler leaves nothing behind."""
+
+        async def handler(event, data):
+            data["db"].add(User(telegram_id=1, first_name="Test"))
+            await data["db"].flush()
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await DatabaseSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        assert await count_users(session_factory) == 0
+
+
+class TestSessionDuringReplies:
+    """Test replies only end the update's transaction when they must wait."""
+
+    @pytest.fixture
+    def queue(self):
+        return SendQueue(max_retries=0)
+
+    async def reply(self, queue, data, make_request):
+        data["db"].add(User(telegram_id=1, first_name="Test"))
+        await data["db"].flush()
+        await queue(make_request, MagicMock(), SendMessage(chat_id=1, text="hi"))
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_after_reply(self, session_factory, queue):
+        """Test a handler that raises after replying leaves nothing behind."""
+        queue.limiter.hit = AsyncMock(return_value=0.0)
+        make_request = AsyncMock()
+
+        async def handler(event, data):
+            await self.reply(queue, data, make_request)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await DatabaseSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        make_request.assert_awaited_once()
+        assert await count_users(session_factory) == 0
+
+    @pytest.mark.asyncio
+    async def test_waiting_reply_releases_connection(self, session_factory, queue):
+        """Test a reply held back by pacing commits the work done before it."""
+        queue.limiter.hit = AsyncMock(side_effect=[0.01, 0.0])
+        seen = {}
+
+        async def handler(event, data):
+            async def make_request(bot, method):
+                seen["in_transaction"] = data["db"].in_transaction()
+
+            await self.reply(queue, data, make_request)
+
+        await DatabaseSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        assert seen == {"in_transaction": False}
+        assert await count_users(session_factory) == 1
+
+
+class TestUserMiddleware:
+    """Test the sender is resolved only for handlers that take ``user``."""
+
+    @pytest.fixture
+    async def sender(self, test_session):
+        user = User(telegram_id=12345, first_name="Test")
+        test_session.add(user)
+        await test_session.commit()
+        return user
+
+    async def call(self, callback, test_session, telegram_id=12345):
+        data = {
+            "db": test_session,
+            "event_from_user": MagicMock(id=telegram_id),
+            "handler": HandlerObject(callback=callback),
+        }
+
+        async def handler(event, data):
+            return data
+
+        return await UserMiddleware()(handler, MagicMock(), data)
+
+    @pytest.mark.asyncio
+    async def test_resolves_user(self, sender, test_session):
+        """Test the sender's row is passed as ``user``."""
+
+        async def takes_user(message, user): ...
+
+        data = await self.call(takes_user, test_session)
+
+        assert data["user"].id == sender.id
+
+    @pytest.mark.asyncio
+    async def test_unknown_sender(self, sender, test_session):
+        """Test an unregistered sender is passed as None."""
+
+        async def takes_user(message, user): ...
+
+        data = await self.call(takes_user, test_session, telegram_id=1)
+
+        assert data["user"] is None
+
+    @pytest.mark.asyncio
+    async def test_skips_lookup(self, sender, test_session, assert_max_queries):
+        """Test handlers without ``user`` cost no query."""
+
+        async def no_user(message): ...
+
+        with assert_max_queries(0):
+            data = await self.call(no_user, test_session)
+
+        assert "user" not in data
+
+    @pytest.mark.asyncio
+    async def test_remembers_sender_id(self, sender, test_session):
+        """Test a known sender is loaded by id on later updates."""
+
+        async def takes_user(message, user): ...
+
+        await self.call(takes_user, test_session)
+        test_session.expunge_all()
+        data = await self.call(takes_user, test_session)
+
+        assert user_service.user_ids.get(12345) == sender.id
+        assert data["user"].id == sender.id
+
+    @pytest.mark.asyncio
+    async def test_stale_id_falls_back(self, sender, test_session):
+        """Test a remembered id that no longer matches is looked up again."""
+
+        async def takes_user(message, user): ...
+
+        user_service.user_ids.set(12345, sender.id + 1)
+        data = await self.call(takes_user, test_session)
+
+        assert data["user"].id == sender.id
+        assert user_service.user_ids.get(12345) == sender.id
@@ -0,0 +1,118 @@
+"""Integration tests for the Redis-backed leaderboard."""
+
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.config.settings import settings
+from app.core import leaderboard as leaderboard_module
+from app.core.services.leaderboard import leaderboard_service
+from app.db.models import User
+from app.db.repositories.user import user_repository
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def redis(mock_redis):
+    """Route the leaderboard to a mocked Redis client."""
+    with patch.object(leaderboard_module, "get_redis", return_value=mock_redis):
+        yield mock_redis
+
+
+@pytest.fixture
+async def users(test_session):
+    """Persist three users with different scores."""
+    users = [
+        User(telegram_id=1, username="alice", first_name="Alice", total_score=30),
+        User(telegram_id=2, username=None, first_name="Bob", total_score=50),
+        User(telegram_id=3, username="carol", first_name="Carol", total_score=0),
+    ]
+    test_session.add_all(users)
+    await test_session.commit()
+    return users
+
+
+class TestScoreUpdates:
+    """Test add_score keeps the sorted set in step with committed totals."""
+
+    @pytest.mark.asyncio
+    async def test_committed_score_is_recorded(self, test_session, users, redis):
+        """Test the new total is written with ZADD GT after the commit."""
+        alice = users[0]
+
+        total = await user_repository.add_score(test_session, alice.id, 5)
+
+        assert total == 35
+        redis.zadd.assert_called_once_with(
+            settings.leaderboard_key, {str(alice.id): 35}, gt=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_deferred_score_waits_for_commit(self, test_session, users, redis):
+        """Test commit=False defers the write to publish_pending."""
+        alice = users[0]
+
+        await user_repository.add_score(test_session, alice.id, 5, commit=False)
+        redis.zadd.assert_not_called()
+
+        await test_session.commit()
+        await leaderboard_module.leaderboard.publish_pending(test_session)
+
+        redis.zadd.assert_called_once_with(
+            settings.leaderboard_key, {str(alice.id): 35}, gt=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_pending_score(self, test_session, users, redis):
+        """Test a rolled back total never reaches Redis."""
+        await user_repository.add_score(test_session, users[0].id, 5, commit=False)
+
+        await test_session.rollback()
+        await leaderboard_module.leaderboard.publish_pending(test_session)
+
+        redis.zadd.assert_not_called()
+
+
+class TestLeaderboardReads:
+    """Test reading and rebuilding the leaderboard."""
+
+    @pytest.mark.asyncio
+    async def test_top_entries_use_redis_order(self, test_session, users, redis):
+        """Test ranks follow the sorted set and names come from the database."""
+        alice, bob, _ = users
+        redis.zrevrange.return_value = [
+            (str(bob.id).encode(), 50.0),
+            (str(alice.id).encode(), 30.0),
+        ]
+
+        entries = await leaderboard_service.get_top(test_session, 10)
+
+        assert [(e.rank, e.name, e.score) for e in entries] == [
+            (1, "Bob", 50),
+            (2, "alice", 30),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_top_falls_back_to_database(self, test_session, users, redis):
+        """Test an unavailable Redis falls back to ORDER BY total_score."""
+        redis.zrevrange.side_effect = ConnectionError("down")
+
+        entries = await leaderboard_service.get_top(test_session, 10)
+
+        assert [(e.name, e.score) for e in entries] == [("Bob", 50), ("alice", 30)]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_swaps_in_new_set(self, test_session, users, redis):
+        """Test rebuild writes scored users to a temp key and renames it."""
+        alice, bob, _ = users
+        tmp_key = f"{settings.leaderboard_key}:rebuild"
+
+        total = await leaderboard_service.rebuild(test_session)
+
+        assert total == 2
+        redis.zadd.assert_called_once_with(
+            tmp_key, {str(alice.id): 30, str(bob.id): 50}
+        )
+        redis.rename.assert_called_once_with(tmp_key, settings.leaderboard_key)
@@ -1,11 +1,12 @@
 """Integration tests for main application module."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app, setup_bot, start_bot_polling
+from app.main import app, settings, setup_bot, start_bot_polling, start_duties
 
 pytestmark = pytest.mark.integration
 
@@ -118,7 +119,10 @@ class TestMainFunction:
     async def test_main_success_flow(self):
         """Test successful main function flow."""
         with patch("app.main.settings.telegram_bot_token", "123456:test_token"):
-            with patch("app.main.init_database", new_callable=AsyncMock) as mock_init:
+            with (
+                patch("app.main.init_database", new_callable=AsyncMock) as mock_init,
+                patch("app.main.load_quest_catalog", new_callable=AsyncMock),
+            ):
                 with patch("app.main.setup_bot") as mock_setup:
                     with patch("app.main.dp") as mock_dp:
                         with patch(
@@ -151,7 +155,10 @@ class TestMainFunction:
     async def test_main_bot_failure(self):
         """Test main function with bot failure."""
         with patch("app.main.settings.telegram_bot_token", "123456:test_token"):
-            with patch("app.main.init_database", new_callable=AsyncMock):
+            with (
+                patch("app.main.init_database", new_callable=AsyncMock),
+                patch("app.main.load_quest_catalog", new_callable=AsyncMock),
+            ):
                 with patch("app.main.setup_bot"):
                     with patch("app.main.dp") as mock_dp:
                         mock_dp.start_polling = AsyncMock(
@@ -174,3 +181,49 @@ class TestMainFunction:
                             mock_logger.error.assert_called_with(
                                 "Bot failed: Bot failed"
                             )
+
+
+class TestProcessRoles:
+    """Test each process role starts only its own duties."""
+
+    @pytest.fixture
+    def run_as_leader(self, monkeypatch):
+        monkeypatch.setattr(settings, "telegram_bot_token", "123456:test_token")
+        monkeypatch.setattr(settings, "telegram_webhook_url", None)
+        monkeypatch.setattr(settings, "streak_reminders_enabled", True)
+        with (
+            patch("app.main.get_bot"),
+            patch("app.main.run_as_leader", new_callable=AsyncMock) as run_as_leader,
+        ):
+            yield run_as_leader
+
+    async def leading(self, run_as_leader, role, monkeypatch) -> list[str]:
+        monkeypatch.setattr(settings, "process_role", role)
+        await asyncio.gather(*await start_duties())
+        return [call.args[0] for call in run_as_leader.await_args_list]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "role, duties",
+        [
+            ("api", []),
+            ("bot", ["polling"]),
+            ("worker", ["streak_reminders"]),
+            ("all", ["polling", "streak_reminders"]),
+        ],
+    )
+    async def test_role_duties(self, run_as_leader, monkeypatch, role, duties):
+        """Test polling and jobs only start in their roles, under a lock."""
+        assert await self.leading(run_as_leader, role, monkeypatch) == duties
+
+    @pytest.mark.asyncio
+    async def test_webhook_needs_no_leader(self, run_as_leader, monkeypatch):
+        """Test every bot process serves the webhook without a lock."""
+        monkeypatch.setattr(
+            settings, "telegram_webhook_url", "https://example.com/telegram/webhook"
+        )
+
+        with patch("app.main.start_bot_webhook", new_callable=AsyncMock) as webhook:
+            assert await self.leading(run_as_leader, "bot", monkeypatch) == []
+
+        webhook.assert_awaited_once()
@@ -0,0 +1,108 @@
+"""Integration tests for the progress repository."""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import Chapter, DifficultyLevel, Quest, QuestType, User, UserProgress
+from app.db.repositories.progress import progress_repository
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+async def user_and_quest(test_session):
+    """Persist one user and one quest to attach progress to."""
+    user = User(telegram_id=12345, username="testuser", first_name="Test")
+    chapter = Chapter(
+        title="Vim Basics", difficulty=DifficultyLevel.BEGINNER, order_index=1
+    )
+    test_session.add_all([user, chapter])
+    await test_session.flush()
+
+    quest = Quest(
+        chapter_id=chapter.id,
+        title="The Dot Command",
+        description="Repeat the last change",
+        quest_type=QuestType.COMMAND,
+        difficulty=DifficultyLevel.BEGINNER,
+        order_index=1,
+        vim_command=".",
+    )
+    test_session.add(quest)
+    await test_session.commit()
+    return user, quest
+
+
+class TestCreateOrUpdateProgress:
+    """Test the single-statement progress upsert."""
+
+    @pytest.mark.asyncio
+    async def test_first_submission_inserts_row(self, test_session, user_and_quest):
+        """Test the first call inserts a row with one attempt."""
+        user, quest = user_and_quest
+
+        progress = await progress_repository.create_or_update_progress(
+            test_session, user.id, quest.id, score=5
+        )
+
+        assert progress.attempts == 1
+        assert progress.score == 5
+        assert progress.is_completed is False
+        assert progress.completed_at is None
+
+    @pytest.mark.asyncio
+    async def test_repeated_submissions_merge_into_one_row(
+        self, test_session, user_and_quest
+    ):
+        """Test repeated calls update the same row in place."""
+        user, quest = user_and_quest
+
+        first = await progress_repository.create_or_update_progress(
+            test_session, user.id, quest.id, score=8, hints_used=2
+        )
+        second = await progress_repository.create_or_update_progress(
+            test_session, user.id, quest.id, score=3, is_completed=True, hints_used=1
+        )
+
+        assert second.id == first.id
+        assert second.attempts == 2
+        assert second.score == 8
+        assert second.hints_used == 2
+        assert second.is_completed is True
+        assert second.completed_at is not None
+
+        rows = await progress_repository.get_user_progress(test_session, user.id)
+        assert len(rows) == 1
+
+    @pytest.mark.asyncio
+    async def test_completed_at_is_kept_after_completion(
+        self, test_session, user_and_quest
+    ):
+        """Test later submissions do not reset completion state."""
+        user, quest = user_and_quest
+
+        completed = await progress_repository.create_or_update_progress(
+            test_session, user.id, quest.id, score=10, is_completed=True
+        )
+        completed_at = completed.completed_at
+
+        again = await progress_repository.create_or_update_progress(
+            test_session, user.id, quest.id, score=0, is_completed=False
+        )
+
+        assert again.is_completed is True
+        assert again.completed_at == completed_at
+
+    @pytest.mark.asyncio
+    async def test_duplicate_rows_are_rejected(self, test_session, user_and_quest):
+        """Test the (user_id, quest_id) unique constraint."""
+        user, quest = user_and_quest
+        test_session.add_all(
+            [
+                UserProgress(user_id=user.id, quest_id=quest.id),
+                UserProgress(user_id=user.id, quest_id=quest.id),
+            ]
+        )
+
+        with pytest.raises(IntegrityError):
+            await test_session.commit()
@@ -0,0 +1,260 @@
+"""SQL statement budgets for the hottest bot and API paths.
+
+Each test wraps one handler in ``assert_max_queries``; a change that adds a
+round-trip (or an N+1 loop) fails here instead of showing up in production.
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.auth import create_access_token, validated_init_data
+from app.bot.handlers.quest import quest_answer_handler
+from app.bot.states import start_active_quest
+from app.config.settings import settings
+from app.core import completions
+from app.core.completions import CompletedQuests
+from app.core.services.game import game_service
+from app.core.services.quest import quest_service
+from app.db.base import get_db
+from app.db.models import Chapter, DifficultyLevel, Quest, QuestType, User, UserProgress
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+async def started_quest(test_session):
+    """Persist a user who has started the first of two beginner quests."""
+    user = User(telegram_id=12345, username="testuser", first_name="Test")
+    chapter = Chapter(
+        title="Vim Basics", difficulty=DifficultyLevel.BEGINNER, order_index=1
+    )
+    test_session.add_all([user, chapter])
+    await test_session.flush()
+
+    quests = [
+        Quest(
+            chapter_id=chapter.id,
+            title=f"Quest {index}",
+            description="Save the file",
+            quest_type=QuestType.COMMAND,
+            difficulty=DifficultyLevel.BEGINNER,
+            order_index=index,
+            vim_command=":w",
+        )
+        for index in (1, 2)
+    ]
+    test_session.add_all(quests)
+    await test_session.flush()
+
+    test_session.add(UserProgress(user_id=user.id, quest_id=quests[0].id))
+    await test_session.commit()
+
+    await quest_service.reload_catalog(test_session)
+    return user, quest_service.catalog.get_quest(quests[0].id)
+
+
+@pytest.fixture
+async def api_client(test_session):
+    """API client whose requests share the test session and skip auth checks."""
+    from app.main import app
+
+    async def override_get_db():
+        yield test_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    auth_data = {
+        "user_id": 12345,
+        "username": "testuser",
+        "first_name": "Test",
+        "last_name": None,
+        "auth_date": int(time.time()),
+    }
+    validated_init_data.clear()
+    with patch("app.api.auth.validate_telegram_auth", return_value=auth_data):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as client:
+            yield client
+
+    app.dependency_overrides.pop(get_db, None)
+    validated_init_data.clear()
+
+
+class TestGameServiceBudgets:
+    """Test GameService query budgets."""
+
+    @pytest.mark.asyncio
+    async def test_correct_answer(
+        self, test_session, started_quest, assert_max_queries
+    ):
+        """Test a correct answer costs a locked progress read and two updates."""
+        user, quest = started_quest
+
+        with assert_max_queries(3):
+            is_correct, _, _ = await game_service.submit_answer(
+                test_session, user, quest.id, ":w"
+            )
+
+        assert is_correct is True
+
+    @pytest.mark.asyncio
+    async def test_wrong_answer(self, test_session, started_quest, assert_max_queries):
+        """Test a wrong answer does not touch the users table."""
+        user, quest = started_quest
+
+        with assert_max_queries(2):
+            is_correct, _, _ = await game_service.submit_answer(
+                test_session, user, quest.id, ":q"
+            )
+
+        assert is_correct is False
+
+    @pytest.mark.asyncio
+    async def test_recommendation_from_cached_bitmap(
+        self, test_session, started_quest, mock_redis, monkeypatch, assert_max_queries
+    ):
+        """Test a cached completion bitmap answers without any SQL."""
+        user, quest = started_quest
+        monkeypatch.setattr(settings, "cache_enabled", True)
+        loaded = CompletedQuests.from_ids([0, quest.id])
+        mock_redis.get.return_value = bytes(loaded)
+
+        with (
+            patch.object(completions, "get_redis", return_value=mock_redis),
+            assert_max_queries(0),
+        ):
+            next_quest = await game_service.get_next_recommended_quest(
+                test_session, user.id
+            )
+
+        assert next_quest.id != quest.id
+        assert next_quest.title == "Quest 2"
+
+
+class TestBotHandlerBudgets:
+    """Test bot handler query budgets."""
+
+    @pytest.mark.asyncio
+    async def test_quest_answer_handler(
+        self, test_session, started_quest, make_message, fsm_state, assert_max_queries
+    ):
+        """Test answering a quest stays within its statement budget."""
+        user, quest = started_quest
+        await start_active_quest(fsm_state, quest.id)
+        message = make_message(text=":w", user_id=12345)
+
+        with (
+            patch.object(type(message), "answer", AsyncMock()) as answer,
+            assert_max_queries(4),
+        ):
+            await quest_answer_handler(message, fsm_state, test_session, user)
+
+        answer.assert_called_once()
+
+
+class TestProgressEndpointBudgets:
+    """Test progress endpoint query budgets."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path, budget",
+        [
+            ("/api/v1/progress/progress", 1),
+            ("/api/v1/progress/progress/completed", 1),
+            ("/api/v1/progress/progress/summary", 2),
+        ],
+    )
+    async def test_progress_endpoints(
+        self, api_client, started_quest, path, budget, assert_max_queries
+    ):
+        """Test each progress endpoint stays within its statement budget."""
+        user, _ = started_quest
+        token, _ = create_access_token(user.id)
+
+        with assert_max_queries(budget):
+            response = await api_client.get(
+                path, headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_login_issues_token(
+        self, api_client, started_quest, assert_max_queries
+    ):
+        """Test login upserts the user once and returns a usable token."""
+        with assert_max_queries(2):
+            response = await api_client.post(
+                "/api/v1/auth/login", json={"init_data": "validated-by-patch"}
+            )
+
+        assert response.status_code == 200
+        token = response.json()["access_token"]
+
+        with assert_max_queries(1):
+            response = await api_client.get(
+                "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert response.json()["telegram_id"] == 12345
+
+
+class TestCatalogEndpointBudgets:
+    """Test conditional catalog requests."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/quests/chapters",
+            "/api/v1/quests/chapters/{chapter_id}/quests",
+            "/api/v1/quests/quests/{quest_id}",
+        ],
+    )
+    async def test_matching_etag_returns_not_modified(
+        self, api_client, started_quest, path, assert_max_queries
+    ):
+        """Test a revalidation with the current ETag costs no SQL."""
+        user, quest = started_quest
+        path = path.format(chapter_id=quest.chapter_id, quest_id=quest.id)
+        headers = {"Authorization": f"Bearer {create_access_token(user.id)[0]}"}
+
+        response = await api_client.get(path, headers=headers)
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+        with assert_max_queries(0):
+            response = await api_client.get(
+                path, headers={**headers, "If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_with_content(
+        self, api_client, test_session, started_quest
+    ):
+        """Test editing quest content invalidates the previous ETag."""
+        user, quest = started_quest
+        headers = {"Authorization": f"Bearer {create_access_token(user.id)[0]}"}
+        path = f"/api/v1/quests/quests/{quest.id}"
+        etag = (await api_client.get(path, headers=headers)).headers["etag"]
+
+        row = await test_session.get(Quest, quest.id)
+        row.title = "Write the buffer"
+        await test_session.commit()
+        await quest_service.reload_catalog(test_session)
+
+        response = await api_client.get(
+            path, headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["title"] == "Write the buffer"
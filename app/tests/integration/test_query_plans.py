@@ -0,0 +1,173 @@
+"""Query plan checks for hot repository queries.
+
+Each repository query below runs against a large seeded PostgreSQL dataset.
+The SQL it emits is captured and re-run under EXPLAIN; a sequential scan
+anywhere in the plan means an index is missing. The checks only run when
+QUERY_PLAN_TESTS=1 is set. They drop and recreate every table, so they use
+TEST_DATABASE_URL, which must be a PostgreSQL database other than
+DATABASE_URL.
+"""
+
+import os
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.config.settings import settings
+from app.db.base import create_postgres_engine, get_async_database_url
+from app.db.models import Base, DifficultyLevel
+from app.db.repositories.progress import progress_repository
+from app.db.repositories.quest import chapter_repository, quest_repository
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        os.environ.get("QUERY_PLAN_TESTS") != "1",
+        reason="Query plan checks need QUERY_PLAN_TESTS=1",
+    ),
+]
+
+USERS = 20_000
+CHAPTERS = 50_000
+QUESTS = 100_000
+PROGRESS_PER_USER = 25
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (id, telegram_id, first_name, total_score)
+    SELECT i, 1000000 + i, 'user' || i, 0
+    FROM generate_series(1, {USERS}) AS i
+    """,
+    # Only a few chapters are live, the rest are archived content.
+    f"""
+    INSERT INTO chapters (id, title, difficulty, order_index, is_active)
+    SELECT i, 'chapter ' || i, 'BEGINNER'::difficultylevel, i, i % 500 = 0
+    FROM generate_series(1, {CHAPTERS}) AS i
+    """,
+    f"""
+    INSERT INTO quests (
+        id, chapter_id, title, description, quest_type, difficulty,
+        order_index, is_active
+    )
+    SELECT
+        i,
+        i % {CHAPTERS} + 1,
+        'quest ' || i,
+        'description',
+        'COMMAND'::questtype,
+        (CASE WHEN i % 1000 = 0 THEN 'BEGINNER' ELSE 'ADVANCED' END)::difficultylevel,
+        i % 100,
+        i % 10 = 0
+    FROM generate_series(1, {QUESTS}) AS i
+    """,
+    f"""
+    INSERT INTO user_progress (
+        user_id, quest_id, is_completed, score, attempts, hints_used
+    )
+    SELECT i % {USERS} + 1, i / {USERS} + 1, i % 3 <> 0, 10, 1, 0
+    FROM generate_series(0, {USERS * PROGRESS_PER_USER - 1}) AS i
+    """,
+    "ANALYZE",
+]
+
+
+@contextmanager
+def capture_statements(sync_engine: Engine) -> Iterator[list[tuple]]:
+    """Record every statement sent to the database while active."""
+    statements: list[tuple] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+async def plan_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Engine for the throwaway database the dataset is seeded into."""
+    url = settings.test_database_url
+    if not url or not url.startswith("postgresql"):
+        pytest.fail("Query plan checks need a PostgreSQL TEST_DATABASE_URL")
+    if url == settings.database_url:
+        pytest.fail("TEST_DATABASE_URL must not be DATABASE_URL: it is wiped")
+
+    engine = create_postgres_engine(get_async_database_url(url))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def seeded_database(plan_engine):
+    """Create the schema and fill it with a production-sized dataset."""
+    async with plan_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for statement in SEED_SQL:
+            await conn.execute(text(statement))
+
+    yield
+
+    async with plan_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+REPOSITORY_QUERIES = {
+    "ProgressRepository.get_user_progress": lambda db: (
+        progress_repository.get_user_progress(db, 42)
+    ),
+    "ProgressRepository.get_completed_quests": lambda db: (
+        progress_repository.get_completed_quests(db, 42)
+    ),
+    "ProgressRepository.get_user_progress_page": lambda db: (
+        progress_repository.get_user_progress_page(db, 42, limit=20)
+    ),
+    "ProgressRepository.get_quest_progress": lambda db: (
+        progress_repository.get_quest_progress(db, 42, 7)
+    ),
+    "QuestRepository.get_by_chapter": lambda db: quest_repository.get_by_chapter(
+        db, 500
+    ),
+    "QuestRepository.get_by_difficulty": lambda db: quest_repository.get_by_difficulty(
+        db, DifficultyLevel.BEGINNER
+    ),
+    "ChapterRepository.get_active_chapters": lambda db: (
+        chapter_repository.get_active_chapters(db)
+    ),
+}
+
+
+class TestQueryPlans:
+    """Test hot repository queries are served by indexes."""
+
+    @pytest.mark.asyncio
+    async def test_repository_queries_avoid_sequential_scans(
+        self, plan_engine, seeded_database
+    ):
+        """Test no hot query plan contains a sequential scan."""
+        session_factory = async_sessionmaker(plan_engine, expire_on_commit=False)
+        failures = []
+
+        for name, query in REPOSITORY_QUERIES.items():
+            async with session_factory() as db:
+                with capture_statements(plan_engine.sync_engine) as statements:
+                    await query(db)
+
+                for statement, parameters in statements:
+                    conn = await db.connection()
+                    plan_rows = await conn.exec_driver_sql(
+                        f"EXPLAIN {statement}", parameters
+                    )
+                    plan = "\n".join(row[0] for row in plan_rows)
+                    if "Seq Scan" in plan:
+                        failures.append(f"{name}:\n{plan}")
+
+        assert not failures, "Sequential scans found:\n\n" + "\n\n".join(failures)
@@ -0,0 +1,168 @@
+"""Integration tests for the active quest FSM state."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram.types import CallbackQuery, Message
+
+from app.bot.handlers.quest import (
+    cancel_quest_callback,
+    hint_callback,
+    quest_answer_handler,
+    start_quest_callback,
+)
+from app.bot.states import QuestStates, get_active_quest, start_active_quest
+from app.core.services.quest import quest_service
+from app.db.models import Chapter, DifficultyLevel, Quest, QuestType, User
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+async def user(test_session):
+    """Persist the user the handlers act for."""
+    user = User(telegram_id=12345, username="testuser", first_name="Test")
+    test_session.add(user)
+    await test_session.commit()
+    return user
+
+
+@pytest.fixture
+async def quest(test_session, user):
+    """Persist one quest and stub out replies to Telegram."""
+    chapter = Chapter(
+        title="Vim Basics", difficulty=DifficultyLevel.BEGINNER, order_index=1
+    )
+    test_session.add(chapter)
+    await test_session.flush()
+
+    quest = Quest(
+        chapter_id=chapter.id,
+        title="Save",
+        description="Save the file",
+        quest_type=QuestType.COMMAND,
+        difficulty=DifficultyLevel.BEGINNER,
+        order_index=1,
+        vim_command=":w",
+        hints=["Write", "Colon w"],
+    )
+    test_session.add(quest)
+    await test_session.commit()
+    await quest_service.reload_catalog(test_session)
+
+    with (
+        patch.object(Message, "answer", AsyncMock()),
+        patch.object(Message, "edit_text", AsyncMock()),
+        patch.object(CallbackQuery, "answer", AsyncMock()),
+    ):
+        yield quest
+
+
+class TestActiveQuestState:
+    """Test the quest handlers keep the active quest in FSM storage."""
+
+    @pytest.mark.asyncio
+    async def test_start_records_active_quest(
+        self, quest, user, test_session, make_callback_query, fsm_state
+    ):
+        """Test starting a quest stores its id, start time and hints."""
+        callback = make_callback_query(data=f"start_quest:{quest.id}")
+
+        await start_quest_callback(callback, fsm_state, test_session, user)
+
+        active = await get_active_quest(fsm_state)
+        assert await fsm_state.get_state() == QuestStates.answering.state
+        assert active.quest_id == quest.id
+        assert active.hints_used == 0
+
+    @pytest.mark.asyncio
+    async def test_restart_keeps_penalties(self, quest, fsm_state):
+        """Test restarting the active quest keeps its start time and hints."""
+        first = await start_active_quest(fsm_state, quest.id)
+        await fsm_state.update_data(hints_used=1)
+
+        again = await start_active_quest(fsm_state, quest.id)
+
+        assert again.started_at == first.started_at
+        assert again.hints_used == 1
+
+    @pytest.mark.asyncio
+    async def test_hint_is_counted(
+        self, quest, test_session, make_callback_query, fsm_state
+    ):
+        """Test taking a hint raises the stored hint count."""
+        await start_active_quest(fsm_state, quest.id)
+        callback = make_callback_query(data=f"hint:{quest.id}:0")
+
+        await hint_callback(callback, fsm_state, test_session)
+
+        assert (await get_active_quest(fsm_state)).hints_used == 1
+
+    @pytest.mark.asyncio
+    async def test_wrong_answer_keeps_state(
+        self, quest, user, test_session, make_callback_query, make_message, fsm_state
+    ):
+        """Test a wrong answer leaves the quest active for another try."""
+        callback = make_callback_query(data=f"start_quest:{quest.id}")
+        await start_quest_callback(callback, fsm_state, test_session, user)
+
+        await quest_answer_handler(
+            make_message(text=":q"), fsm_state, test_session, user
+        )
+
+        assert (await get_active_quest(fsm_state)).quest_id == quest.id
+
+    @pytest.mark.asyncio
+    async def test_answer_is_escaped(
+        self, quest, user, test_session, make_callback_query, make_message, fsm_state
+    ):
+        """Test Vim keys such as <C-w> are quoted in the HTML reply."""
+        callback = make_callback_query(data=f"start_quest:{quest.id}")
+        await start_quest_callback(callback, fsm_state, test_session, user)
+
+        await quest_answer_handler(
+            make_message(text="<C-w>&"), fsm_state, test_session, user
+        )
+
+        reply = Message.answer.await_args.args[0]
+        assert "<code>&lt;C-w&gt;&amp;</code>" in reply
+
+    @pytest.mark.asyncio
+    async def test_unstarted_quest_clears_state(
+        self, quest, user, test_session, make_message, fsm_state
+    ):
+        """Test a message for a quest without progress is not taken as an answer."""
+        await start_active_quest(fsm_state, quest.id)
+
+        await quest_answer_handler(
+            make_message(text=":w"), fsm_state, test_session, user
+        )
+
+        assert await fsm_state.get_state() is None
+        assert "Неправильно" not in Message.answer.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_correct_answer_clears_state(
+        self, quest, user, test_session, make_callback_query, make_message, fsm_state
+    ):
+        """Test a correct answer finishes the quest and clears the state."""
+        callback = make_callback_query(data=f"start_quest:{quest.id}")
+        await start_quest_callback(callback, fsm_state, test_session, user)
+
+        await quest_answer_handler(
+            make_message(text=":w"), fsm_state, test_session, user
+        )
+
+        assert await fsm_state.get_state() is None
+        assert await get_active_quest(fsm_state) is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_clears_state(self, quest, make_callback_query, fsm_state):
+        """Test cancelling a quest clears the state."""
+        await start_active_quest(fsm_state, quest.id)
+
+        await cancel_quest_callback(
+            make_callback_query(data=f"cancel_quest:{quest.id}"), fsm_state
+        )
+
+        assert await fsm_state.get_state() is None
@@ -0,0 +1,147 @@
+"""Integration tests for streak reminders."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bot import reminders as reminders_module
+from app.bot.reminders import StreakReminders
+from app.db.models import User, UserStatus
+
+pytestmark = pytest.mark.integration
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+class FakeRedis:
+    """Just enough of a Redis hash for the reminder checkpoint."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def hgetall(self, key):
+        fields = self.hashes.get(key, {})
+        return {field.encode(): value.encode() for field, value in fields.items()}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field, None)
+
+
+def idle(telegram_id: int, hours: float, **kwargs) -> User:
+    return User(
+        telegram_id=telegram_id,
+        first_name=f"User {telegram_id}",
+        last_activity=NOW - timedelta(hours=hours),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+async def users(test_session):
+    """Users idle for various times; 48h resets a streak, 6h lead."""
+    test_session.add_all(
+        [
+            idle(1, 44),
+            idle(2, 47),
+            idle(3, 10),
+            idle(4, 50),
+            idle(5, 45, status=UserStatus.BANNED),
+            idle(6, 40),
+        ]
+    )
+    await test_session.commit()
+
+
+@pytest.fixture
+def redis(test_engine):
+    """Read users from the test database and checkpoint in memory."""
+    redis = FakeRedis()
+    session_factory = async_sessionmaker(test_engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with session_factory() as db:
+            yield db
+
+    with (
+        patch.object(reminders_module, "get_session", get_session),
+        patch.object(reminders_module, "get_redis", return_value=redis),
+    ):
+        yield redis
+
+
+@pytest.fixture
+def bot():
+    return MagicMock(send_message=AsyncMock())
+
+
+def reminded(bot) -> list[int]:
+    return [call.args[0] for call in bot.send_message.await_args_list]
+
+
+class TestStreakReminders:
+    """Test reminder passes over users by last activity."""
+
+    @pytest.mark.asyncio
+    async def test_reminds_due_users_once(self, users, redis, bot):
+        """Test only active users close to a reset are reminded, once."""
+        sent = await StreakReminders().run_pass(bot, now=NOW)
+        again = await StreakReminders().run_pass(bot, now=NOW)
+
+        assert sent == 2
+        assert again == 0
+        assert reminded(bot) == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_next_pass_picks_up_newly_due(self, users, redis, bot):
+        """Test a later pass continues from where the last one stopped."""
+        await StreakReminders().run_pass(bot, now=NOW)
+        bot.send_message.reset_mock()
+
+        sent = await StreakReminders().run_pass(bot, now=NOW + timedelta(hours=3))
+
+        assert sent == 1
+        assert reminded(bot) == [6]
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_last_batch(self, users, redis, bot, monkeypatch):
+        """Test an interrupted pass resumes after its last checkpointed batch."""
+        monkeypatch.setattr(reminders_module.settings, "streak_reminder_batch_size", 1)
+        hset = redis.hset
+
+        async def crash_on_second_checkpoint(key, field, value):
+            if field == "cursor" and "cursor" in redis.hashes[key]:
+                raise ConnectionError("worker died")
+            await hset(key, field, value)
+
+        monkeypatch.setattr(redis, "hset", crash_on_second_checkpoint)
+        with pytest.raises(ConnectionError):
+            await StreakReminders().run_pass(bot, now=NOW)
+
+        monkeypatch.setattr(redis, "hset", hset)
+        bot.send_message.reset_mock()
+        sent = await StreakReminders().run_pass(bot, now=NOW + timedelta(hours=3))
+
+        assert sent == 1
+        assert reminded(bot) == [1]
+
+    @pytest.mark.asyncio
+    async def test_blocked_user_is_skipped(self, users, redis, bot):
+        """Test a user who blocked the bot does not stop the pass."""
+        blocked = TelegramForbiddenError(
+            method=SendMessage(chat_id=2, text=""), message="bot was blocked"
+        )
+        bot.send_message.side_effect = [blocked, None]
+
+        sent = await StreakReminders().run_pass(bot, now=NOW)
+
+        assert sent == 1
+        assert reminded(bot) == [2, 1]
@@ -0,0 +1,122 @@
+"""Integration tests for webhook update ingestion."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.bot.webhook import SECRET_TOKEN_HEADER, UpdateFeeder
+from app.config.settings import settings
+
+pytestmark = pytest.mark.integration
+
+SECRET = "webhook-secret"
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 1234567890,
+        "chat": {"id": 12345, "type": "private"},
+        "from": {"id": 12345, "is_bot": False, "first_name": "Test"},
+        "text": "/start",
+    },
+}
+
+
+@pytest.fixture
+async def webhook_client(monkeypatch):
+    """API client with webhook mode configured and a stub bot."""
+    from app import main
+
+    monkeypatch.setattr(settings, "telegram_webhook_url", "https://example.com/hook")
+    monkeypatch.setattr(settings, "telegram_webhook_secret_token", SECRET)
+    feeder = MagicMock()
+    feeder.submit.return_value = True
+
+    with (
+        patch.object(main, "get_bot", return_value=MagicMock()),
+        patch.object(main, "update_feeder", feeder),
+    ):
+        async with AsyncClient(
+            transport=ASGITransport(app=main.app), base_url="http://testserver"
+        ) as client:
+            yield client, feeder
+
+
+class TestWebhookRoute:
+    """Test the webhook route validates and hands off updates."""
+
+    @pytest.mark.asyncio
+    async def test_update_is_acknowledged(self, webhook_client):
+        """Test a signed update is queued and answered with 200."""
+        client, feeder = webhook_client
+
+        response = await client.post(
+            settings.telegram_webhook_path,
+            json=UPDATE,
+            headers={SECRET_TOKEN_HEADER: SECRET},
+        )
+
+        assert response.status_code == 200
+        update = feeder.submit.call_args.args[1]
+        assert update.message.text == "/start"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [{}, {SECRET_TOKEN_HEADER: "wrong"}])
+    async def test_wrong_secret_is_rejected(self, webhook_client, headers):
+        """Test updates without the secret token are refused."""
+        client, feeder = webhook_client
+
+        response = await client.post(
+            settings.telegram_webhook_path, json=UPDATE, headers=headers
+        )
+
+        assert response.status_code == 401
+        feeder.submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_full_backlog_asks_for_redelivery(self, webhook_client):
+        """Test a full backlog answers 503 so Telegram retries later."""
+        client, feeder = webhook_client
+        feeder.submit.return_value = False
+
+        response = await client.post(
+            settings.telegram_webhook_path,
+            json=UPDATE,
+            headers={SECRET_TOKEN_HEADER: SECRET},
+        )
+
+        assert response.status_code == 503
+
+
+class TestUpdateFeeder:
+    """Test UpdateFeeder bounds concurrency and backlog."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_backlog(self):
+        """Test at most max_concurrency updates run and the backlog is capped."""
+        running = 0
+        peak = 0
+        release = asyncio.Event()
+
+        async def feed_update(bot, update):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+        dispatcher = MagicMock(feed_update=AsyncMock(side_effect=feed_update))
+        feeder = UpdateFeeder(dispatcher, max_concurrency=2, max_pending=5)
+
+        accepted = [feeder.submit(MagicMock(), MagicMock()) for _ in range(6)]
+        await asyncio.sleep(0)
+        release.set()
+        await feeder.drain(timeout=1.0)
+
+        assert accepted == [True] * 5 + [False]
+        assert peak == 2
+        assert dispatcher.feed_update.await_count == 5
+        assert feeder.pending == 0
@@ -0,0 +1,157 @@
+"""Unit tests for Telegram init_data authentication."""
+
+import hashlib
+import hmac
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import auth
+from app.api.auth import (
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+    get_webapp_secret,
+    validate_telegram_auth,
+)
+from app.core.cache import TTLCache
+
+pytestmark = pytest.mark.unit
+
+BOT_TOKEN = "123456:TEST_TOKEN"
+
+
+def make_init_data(auth_date: int | None = None, user_id: int = 42) -> str:
+    """Build init_data signed the way Telegram signs it."""
+    fields = {
+        "auth_date": str(auth_date or int(time.time())),
+        "user": json.dumps({"id": user_id, "first_name": "Ada"}),
+    }
+    check_string = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    secret = hmac.new(b"WebAppData", BOT_TOKEN.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret, check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+@pytest.fixture(autouse=True)
+def bot_token():
+    with patch.object(auth.settings, "telegram_bot_token", BOT_TOKEN):
+        auth.validated_init_data.clear()
+        yield
+        auth.validated_init_data.clear()
+
+
+class TestValidateTelegramAuth:
+    """Test init_data signature validation."""
+
+    def test_valid_init_data(self):
+        """Test correctly signed init_data is accepted."""
+        data = validate_telegram_auth(make_init_data(user_id=7))
+
+        assert data["user_id"] == 7
+        assert data["first_name"] == "Ada"
+
+    def test_tampered_init_data(self):
+        """Test a changed field invalidates the hash."""
+        init_data = make_init_data(user_id=7).replace("%22id%22%3A+7", "%22id%22%3A+8")
+
+        with pytest.raises(HTTPException):
+            validate_telegram_auth(init_data)
+
+    def test_secret_is_derived_once_per_token(self):
+        """Test the WebAppData key is computed once and reused."""
+        assert get_webapp_secret(BOT_TOKEN) is get_webapp_secret(BOT_TOKEN)
+
+
+class TestGetCurrentUser:
+    """Test the validated init_data cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_calls_skip_validation_and_upsert(self):
+        """Test the second call with the same init_data only loads the user."""
+        user = MagicMock(id=1)
+        init_data = make_init_data()
+
+        with patch.object(auth, "user_service") as user_service:
+            user_service.get_or_create_user = AsyncMock(return_value=user)
+            user_service.get_user = AsyncMock(return_value=user)
+
+            assert await get_current_user(MagicMock(), init_data) is user
+            with patch.object(auth, "validate_telegram_auth") as validate:
+                assert await get_current_user(MagicMock(), init_data) is user
+
+        validate.assert_not_called()
+        user_service.get_or_create_user.assert_called_once()
+        user_service.get_user.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_with_init_data(self):
+        """Test cached entries expire at auth_date + 24h."""
+        auth_date = int(time.time()) - auth.AUTH_MAX_AGE + 60
+        init_data = make_init_data(auth_date=auth_date)
+
+        with patch.object(auth, "user_service") as user_service:
+            user_service.get_or_create_user = AsyncMock(return_value=MagicMock(id=1))
+            await get_current_user(MagicMock(), init_data)
+
+        key = hashlib.sha256(init_data.encode()).digest()
+        _, expires_at = auth.validated_init_data._entries[key]
+        assert expires_at == auth_date + auth.AUTH_MAX_AGE
+
+
+class TestAccessToken:
+    """Test signed session tokens."""
+
+    def test_round_trip(self):
+        """Test a fresh token decodes to the user id it was issued for."""
+        token, expires_in = create_access_token(42)
+
+        assert decode_access_token(token) == 42
+        assert expires_in == auth.settings.access_token_expire_minutes * 60
+
+    def test_expired_token(self):
+        """Test a token past its exp claim is rejected."""
+        with patch.object(auth.settings, "access_token_expire_minutes", -1):
+            token, _ = create_access_token(42)
+
+        with pytest.raises(HTTPException) as exc_info:
+            decode_access_token(token)
+        assert exc_info.value.status_code == 401
+
+    def test_foreign_signature(self):
+        """Test a token signed with another key is rejected."""
+        with patch.object(auth.settings, "secret_key", "another-key"):
+            token, _ = create_access_token(42)
+
+        with pytest.raises(HTTPException):
+            decode_access_token(token)
+
+
+class TestTTLCache:
+    """Test the bounded in-process TTL cache."""
+
+    def test_expired_entries_are_dropped(self):
+        """Test an entry past its expiry time is a miss."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("fresh", 1)
+        cache.set("stale", 2, expires_at=time.time() - 1)
+
+        assert cache.get("fresh") == 1
+        assert cache.get("stale") is None
+        assert len(cache) == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache never grows past maxsize."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
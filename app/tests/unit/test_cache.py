@@ -0,0 +1,102 @@
+"""Unit tests for the shared Redis cache tier."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.config.settings import settings
+from app.core import cache
+from app.core.cache import RedisCache
+from app.core.catalog import QuestCatalog
+from app.core.services.quest import QuestService
+from app.tests.unit.test_catalog import make_chapter, make_quest
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def redis(mock_redis, monkeypatch):
+    """Enable the cache and route it to a mocked Redis client."""
+    monkeypatch.setattr(settings, "cache_enabled", True)
+    mock_redis.scan_iter = MagicMock(return_value=async_iter([]))
+    with patch.object(cache, "get_redis", return_value=mock_redis):
+        yield mock_redis
+
+
+async def async_iter(items):
+    for item in items:
+        yield item
+
+
+class TestRedisCache:
+    """Test RedisCache reads, writes and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_keys_are_namespaced_and_expire(self, redis):
+        """Test values are stored under the namespace with the TTL."""
+        await RedisCache("catalog", ttl=60).set("snapshot", b"payload")
+
+        redis.set.assert_called_once_with(
+            f"{settings.cache_key_prefix}:catalog:snapshot", b"payload", ex=60
+        )
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_misses(self, redis):
+        """Test an unavailable Redis behaves like an empty cache."""
+        redis.get.side_effect = ConnectionError("down")
+
+        assert await RedisCache("catalog").get("snapshot") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_evicts_and_notifies(self, redis):
+        """Test invalidation deletes the namespace and publishes it."""
+        key = f"{settings.cache_key_prefix}:catalog:snapshot"
+        redis.scan_iter = MagicMock(return_value=async_iter([key]))
+        handler = MagicMock()
+        cache.on_invalidate("test-namespace", handler)
+
+        await RedisCache("test-namespace").invalidate()
+
+        handler.assert_called_once_with()
+        redis.unlink.assert_called_once_with(key)
+        redis.publish.assert_called_once_with(
+            settings.cache_invalidation_channel, "test-namespace"
+        )
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_skips_redis(self, mock_redis):
+        """Test nothing reaches Redis when the cache is disabled."""
+        with patch.object(cache, "get_redis", return_value=mock_redis):
+            assert await RedisCache("catalog").get("snapshot") is None
+            await RedisCache("catalog").set("snapshot", b"payload")
+
+        mock_redis.get.assert_not_called()
+        mock_redis.set.assert_not_called()
+
+
+class TestCatalogCaching:
+    """Test QuestService loads the catalog through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_served_from_redis(self, redis):
+        """Test a cached snapshot is used without touching the database."""
+        snapshot = QuestCatalog((make_chapter(1, 1),), (make_quest(1, 1, 1),))
+        redis.get.return_value = snapshot.to_json()
+        db = MagicMock()
+
+        catalog = await QuestService().load_catalog(db)
+
+        assert catalog.version == snapshot.version
+        assert catalog.get_quest(1) == snapshot.get_quest(1)
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_the_snapshot(self, redis):
+        """Test a published invalidation forces the next lookup to reload."""
+        service = QuestService()
+        service.catalog = QuestCatalog()
+
+        cache.dispatch_invalidation("catalog")
+
+        assert service.catalog is None
@@ -0,0 +1,143 @@
+"""Unit tests for the quest catalog snapshot."""
+
+import dataclasses
+import json
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.api.endpoints.quests import QUEST_FIELDS, render_list, render_one
+from app.api.schemas import QuestResponse
+from app.core.catalog import CatalogChapter, CatalogQuest, QuestCatalog
+from app.db.models import DifficultyLevel, QuestType
+
+pytestmark = pytest.mark.unit
+
+
+def make_chapter(id: int, order_index: int, is_active: bool = True) -> CatalogChapter:
+    return CatalogChapter(
+        id=id,
+        title=f"Chapter {id}",
+        description=None,
+        difficulty=DifficultyLevel.BEGINNER,
+        order_index=order_index,
+        is_active=is_active,
+        unlock_score=0,
+        created_at=None,
+    )
+
+
+def make_quest(
+    id: int,
+    chapter_id: int,
+    order_index: int,
+    difficulty: DifficultyLevel = DifficultyLevel.BEGINNER,
+    is_active: bool = True,
+) -> CatalogQuest:
+    return CatalogQuest(
+        id=id,
+        chapter_id=chapter_id,
+        title=f"Quest {id}",
+        description="Save the file",
+        quest_type=QuestType.COMMAND,
+        difficulty=difficulty,
+        order_index=order_index,
+        initial_text=None,
+        expected_result=None,
+        vim_command=":w",
+        hints=("Use :w",),
+        max_score=10,
+        time_limit=None,
+        is_active=is_active,
+        created_at=None,
+    )
+
+
+@pytest.fixture
+def catalog() -> QuestCatalog:
+    return QuestCatalog(
+        chapters=(make_chapter(1, 2), make_chapter(2, 1), make_chapter(3, 3, False)),
+        quests=(
+            make_quest(1, 1, 2),
+            make_quest(2, 1, 1),
+            make_quest(3, 1, 3, is_active=False),
+            make_quest(4, 2, 1, difficulty=DifficultyLevel.ADVANCED),
+        ),
+    )
+
+
+class TestQuestCatalog:
+    """Test QuestCatalog indexes and immutability."""
+
+    def test_lookup_by_id_includes_inactive(self, catalog):
+        """Test quests are found by id whether or not they are active."""
+        assert catalog.get_quest(2).title == "Quest 2"
+        assert catalog.get_quest(3).is_active is False
+        assert catalog.get_quest(99) is None
+        assert len(catalog) == 4
+
+    def test_chapter_quests_are_active_and_ordered(self, catalog):
+        """Test chapter quests skip inactive ones and follow order_index."""
+        assert [q.id for q in catalog.get_chapter_quests(1)] == [2, 1]
+        assert catalog.get_chapter_quests(99) == ()
+
+    def test_quests_by_difficulty(self, catalog):
+        """Test the difficulty index."""
+        beginner = catalog.get_quests_by_difficulty(DifficultyLevel.BEGINNER)
+        advanced = catalog.get_quests_by_difficulty(DifficultyLevel.ADVANCED)
+
+        assert [q.id for q in beginner] == [2, 1]
+        assert [q.id for q in advanced] == [4]
+
+    def test_active_chapters_are_ordered(self, catalog):
+        """Test only active chapters are listed, in order."""
+        assert [c.id for c in catalog.chapters] == [2, 1]
+        assert catalog.get_chapter(3).is_active is False
+
+    def test_snapshot_is_immutable(self, catalog):
+        """Test neither the catalog nor its entries can be modified."""
+        with pytest.raises(AttributeError):
+            catalog.version = "changed"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            catalog.get_quest(1).title = "changed"
+
+    def test_version_follows_content(self, catalog):
+        """Test the version is stable for equal content and changes otherwise."""
+        same = QuestCatalog(
+            chapters=tuple(reversed((*catalog.chapters, catalog.get_chapter(3)))),
+            quests=tuple(catalog.get_quest(id) for id in (4, 3, 2, 1)),
+        )
+        edited = QuestCatalog(
+            chapters=same.chapters,
+            quests=(make_quest(1, 1, 2),),
+        )
+
+        assert same.version == catalog.version
+        assert edited.version != catalog.version
+
+
+class TestRenderedResponses:
+    """Test catalog responses serialized with orjson."""
+
+    def test_rendered_once_per_snapshot(self, catalog):
+        """Test a response is rendered on first use and then reused."""
+        calls = []
+
+        def render(snapshot: QuestCatalog) -> bytes:
+            calls.append(snapshot)
+            return b"[]"
+
+        assert catalog.rendered("chapters", render) == b"[]"
+        assert catalog.rendered("chapters", render) == b"[]"
+        assert calls == [catalog]
+
+    def test_payload_matches_response_schema(self, catalog):
+        """Test orjson output equals the Pydantic response serialization."""
+        quests = catalog.get_chapter_quests(1)
+        adapter = TypeAdapter(list[QuestResponse])
+        expected = adapter.dump_python(
+            adapter.validate_python(quests, from_attributes=True), mode="json"
+        )
+
+        assert json.loads(render_list(QUEST_FIELDS, quests)) == expected
+        assert "vim_command" not in json.loads(render_one(QUEST_FIELDS, quests[0]))
@@ -0,0 +1,59 @@
+"""Unit tests for the completed-quest bitset."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core import completions
+from app.core.completions import CompletedQuests, CompletionTracker
+
+pytestmark = pytest.mark.unit
+
+
+class TestCompletedQuests:
+    """Test CompletedQuests membership and encoding."""
+
+    def test_membership(self):
+        """Test only the ids that were added are members."""
+        completed = CompletedQuests.from_ids([1, 7, 8, 130])
+
+        assert [id for id in range(140) if id in completed] == [1, 7, 8, 130]
+
+    def test_empty_bitset(self):
+        """Test an empty or missing bitmap contains nothing."""
+        assert 1 not in CompletedQuests()
+        assert 1 not in CompletedQuests.from_ids([])
+        assert CompletedQuests().is_loaded is False
+
+    def test_bit_order_matches_redis(self):
+        """Test offsets follow Redis SETBIT order (bit 0 is the high bit)."""
+        # SETBIT key 0 1; SETBIT key 9 1 -> GET key == b"\x80\x40"
+        completed = CompletedQuests(b"\x80\x40")
+
+        assert completed.is_loaded is True
+        assert 9 in completed
+        assert 8 not in completed
+        built = CompletedQuests.from_ids([0, 9])
+        assert [id for id in range(16) if id in built] == [
+            id for id in range(16) if id in completed
+        ]
+
+
+class TestCompletionTracker:
+    """Test the cached bitmap never misses a recorded completion."""
+
+    @pytest.mark.asyncio
+    async def test_failed_update_drops_bitmap(self, monkeypatch):
+        """Test a bitmap that could not be updated is deleted for a reload."""
+        monkeypatch.setattr(completions.settings, "cache_enabled", True)
+        pipe = MagicMock(execute=AsyncMock(side_effect=ConnectionError("timeout")))
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        redis = MagicMock(pipeline=MagicMock(return_value=pipe), delete=AsyncMock())
+        tracker = CompletionTracker()
+
+        with patch.object(completions, "get_redis", return_value=redis):
+            await tracker.mark_completed(42, 7)
+
+        redis.delete.assert_awaited_once_with(tracker.key(42))
@@ -125,3 +125,29 @@ class TestSettings:
             "https://your-frontend-domain.com",
         ]
         assert settings.allowed_origins == expected_origins
+
+    def test_database_pool_defaults(self):
+        """Test connection pool defaults."""
+        settings = Settings()
+
+        assert settings.database_pool_size == 5
+        assert settings.database_max_overflow == 10
+        assert settings.database_pool_timeout == 30.0
+        assert settings.database_statement_cache_size == 100
+        assert settings.database_pgbouncer is False
+
+    def test_database_pool_from_env(self):
+        """Test connection pool settings loaded from environment variables."""
+        with patch.dict(
+            os.environ,
+            {
+                "DATABASE_POOL_SIZE": "20",
+                "DATABASE_MAX_OVERFLOW": "0",
+                "DATABASE_PGBOUNCER": "true",
+            },
+        ):
+            settings = Settings()
+
+            assert settings.database_pool_size == 20
+            assert settings.database_max_overflow == 0
+            assert settings.database_pgbouncer is True
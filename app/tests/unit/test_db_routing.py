@@ -0,0 +1,97 @@
+"""Unit tests for read/write session routing."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.db import base
+from app.db.base import RoutingSession, is_write_clause
+from app.db.models import User
+
+pytestmark = pytest.mark.unit
+
+
+class TestIsWriteClause:
+    """Test classification of statements as writes."""
+
+    def test_plain_select_is_read(self):
+        """Test a plain SELECT is routed as a read."""
+        assert is_write_clause(select(User)) is False
+
+    def test_locking_select_is_write(self):
+        """Test SELECT ... FOR UPDATE is routed as a write."""
+        assert is_write_clause(select(User).with_for_update()) is True
+
+    def test_dml_is_write(self):
+        """Test INSERT and UPDATE are routed as writes."""
+        assert is_write_clause(insert(User)) is True
+        assert is_write_clause(update(User).values(total_score=0)) is True
+
+    def test_missing_clause_is_read(self):
+        """Test get_bind() without a clause is routed as a read."""
+        assert is_write_clause(None) is False
+
+
+class TestRoutingSession:
+    """Test RoutingSession.get_bind."""
+
+    def test_without_reader_everything_goes_to_primary(self):
+        """Test all statements use the primary when no reader is configured."""
+        with patch.object(base, "read_engine", None):
+            session = RoutingSession()
+            assert session.get_bind(clause=select(User)) is base.engine.sync_engine
+
+    def test_reads_use_reader_until_first_write(self):
+        """Test reads go to the reader and stick to the primary after a write."""
+        reader = MagicMock()
+        with patch.object(base, "read_engine", reader):
+            session = RoutingSession()
+
+            assert session.get_bind(clause=select(User)) is reader.sync_engine
+            assert session.get_bind(clause=insert(User)) is base.engine.sync_engine
+            assert session.get_bind(clause=select(User)) is base.engine.sync_engine
+
+    def test_read_only_reads_use_replica(self):
+        """Test only reads marked read-only are sent to the replica."""
+        replica = MagicMock()
+        with patch.object(base, "replica_engine", replica):
+            session = RoutingSession()
+            assert session.get_bind(clause=select(User)) is base.engine.sync_engine
+
+            session.info["read_only"] = True
+            assert session.get_bind(clause=select(User)) is replica.sync_engine
+
+    def test_locking_read_skips_replica(self):
+        """Test SELECT ... FOR UPDATE stays on the primary even when read-only."""
+        replica = MagicMock()
+        with patch.object(base, "replica_engine", replica):
+            session = RoutingSession()
+            session.info["read_only"] = True
+
+            clause = select(User).with_for_update()
+            assert session.get_bind(clause=clause) is base.engine.sync_engine
+
+
+class TestReadOnlyDecorator:
+    """Test the @read_only repository marker."""
+
+    @pytest.mark.asyncio
+    async def test_flag_is_set_only_during_the_call(self):
+        """Test read_only marks the session for the call and restores it."""
+        from app.db.repositories.base import read_only
+
+        seen = []
+
+        class Repository:
+            @read_only
+            async def fetch(self, db):
+                seen.append(db.info["read_only"])
+                return "rows"
+
+        db = MagicMock()
+        db.info = {}
+
+        assert await Repository().fetch(db) == "rows"
+        assert seen == [True]
+        assert db.info["read_only"] is False
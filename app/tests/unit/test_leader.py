@@ -0,0 +1,150 @@
+"""Unit tests for leader election."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core import leader
+from app.core.leader import LeaderLock, run_as_leader
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def fast_renewal(monkeypatch):
+    """Renew every 10 ms instead of every 10 s."""
+    monkeypatch.setattr(leader.settings, "leader_lock_ttl", 0.03)
+
+
+@pytest.fixture
+def lock_calls():
+    """Stub out the lock; each test decides what acquire and renew return."""
+    calls = {
+        "acquire": AsyncMock(return_value=True),
+        "renew": AsyncMock(return_value=True),
+        "release": AsyncMock(return_value=True),
+    }
+    with patch.multiple(LeaderLock, **calls):
+        yield calls
+
+
+class TestLeaderLock:
+    """Test the Redis commands behind the lock."""
+
+    @pytest.fixture
+    def script(self):
+        script = AsyncMock(return_value=1)
+        redis = MagicMock()
+        redis.register_script.return_value = script
+        with patch.object(leader, "get_redis", return_value=redis):
+            yield script
+
+    @pytest.mark.asyncio
+    async def test_acquire_takes_free_or_own_key(self, script):
+        """Test acquiring may set the key, or refresh it if it is ours."""
+        lock = LeaderLock("polling")
+
+        assert await lock.acquire() is True
+
+        script.assert_awaited_once_with(
+            keys=["vim_master:leader:polling"], args=[lock.token, 30, 1]
+        )
+
+    @pytest.mark.asyncio
+    async def test_renew_checks_holder(self, script):
+        """Test renewing passes the holder token and never takes the key."""
+        script.return_value = 0
+        lock = LeaderLock("polling")
+
+        assert await lock.renew() is False
+
+        script.assert_awaited_once_with(
+            keys=["vim_master:leader:polling"], args=[lock.token, 30, 0]
+        )
+
+
+class TestRunAsLeader:
+    """Test duties only run while the lock is held."""
+
+    @pytest.mark.asyncio
+    async def test_runs_duty_once_acquired(self, lock_calls):
+        """Test a follower keeps retrying and runs the duty once it leads."""
+        lock_calls["acquire"].side_effect = [False, ConnectionError("down"), True]
+        duty = AsyncMock()
+
+        await run_as_leader("polling", duty)
+
+        duty.assert_awaited_once()
+        assert lock_calls["acquire"].await_count == 3
+        lock_calls["release"].assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stops_duty_when_lock_is_lost(self, lock_calls):
+        """Test the duty is cancelled as soon as renewing fails."""
+        lock_calls["renew"].side_effect = [True, False]
+        lock_calls["acquire"].side_effect = [True, asyncio.CancelledError()]
+        started = []
+        cancelled = []
+
+        async def duty():
+            started.append(True)
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_as_leader("streak_reminders", duty)
+
+        assert started == cancelled == [True]
+        assert lock_calls["renew"].await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_keeps_duty_through_redis_errors(self, lock_calls):
+        """Test a renew that cannot reach Redis does not stop the duty."""
+        lock_calls["renew"].side_effect = [ConnectionError("down"), True, True, True]
+        started = []
+
+        async def duty():
+            started.append(True)
+            await asyncio.sleep(0.035)
+            return "done"
+
+        assert await run_as_leader("polling", duty) == "done"
+        assert started == [True]
+        assert lock_calls["renew"].await_count >= 2
+
+    @pytest.mark.asyncio
+    async def test_stops_duty_once_lock_expires(self, lock_calls):
+        """Test the duty is cancelled when the lock's TTL runs out unrenewed."""
+        lock_calls["renew"].side_effect = ConnectionError("down")
+        lock_calls["acquire"].side_effect = [True, asyncio.CancelledError()]
+        cancelled_after = []
+
+        async def duty():
+            started = time.monotonic()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled_after.append(time.monotonic() - started)
+                raise
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_as_leader("streak_reminders", duty)
+
+        assert cancelled_after[0] >= 0.025
+        assert lock_calls["renew"].await_count > 1
+
+    @pytest.mark.asyncio
+    async def test_failing_duty_releases_lock(self, lock_calls):
+        """Test a duty that raises gives the lock up for another process."""
+        duty = AsyncMock(side_effect=RuntimeError("polling failed"))
+
+        with pytest.raises(RuntimeError):
+            await run_as_leader("polling", duty)
+
+        lock_calls["release"].assert_awaited_once()
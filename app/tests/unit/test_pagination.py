@@ -0,0 +1,35 @@
+"""Unit tests for keyset pagination cursors."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.db.repositories.base import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.unit
+
+
+class TestCursor:
+    """Test encode_cursor/decode_cursor."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes back to the key it was built from."""
+        updated_at = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+
+        cursor = encode_cursor(updated_at, 17)
+
+        assert decode_cursor(cursor) == (updated_at, 17)
+
+    def test_cursor_is_url_safe(self):
+        """Test cursors can be passed as query parameters without escaping."""
+        cursor = encode_cursor(datetime(2024, 5, 1), 2**40)
+
+        assert "=" not in cursor
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WzEsMl0", "bnVsbA"])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        """Test malformed cursors are rejected with ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,129 @@
+"""Unit tests for token-bucket flood control."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.types import Update
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError
+
+from app.bot.middlewares import RateLimitMiddleware
+from app.core import rate_limit
+from app.core.rate_limit import LocalBuckets, RateLimiter
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Enable rate limiting with a burst of two and one token per second."""
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_user_rate", 1.0)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_user_burst", 2)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_global_rate", 100.0)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_global_burst", 100)
+
+
+@pytest.fixture
+def redis_down():
+    """Make every Redis script call fail."""
+    redis = MagicMock()
+    redis.register_script.return_value = AsyncMock(side_effect=ConnectionError("down"))
+    with patch.object(rate_limit, "get_redis", return_value=redis):
+        yield
+
+
+class TestLocalBuckets:
+    """Test the in-process token buckets."""
+
+    def test_burst_then_wait(self):
+        """Test hits beyond the burst are told how long to wait."""
+        buckets = LocalBuckets(maxsize=10)
+        limits = {"user": (1.0, 2)}
+
+        with patch.object(rate_limit.time, "monotonic", return_value=100.0):
+            assert buckets.take(limits) == 0
+            assert buckets.take(limits) == 0
+            assert buckets.take(limits) == pytest.approx(1.0)
+
+        with patch.object(rate_limit.time, "monotonic", return_value=101.0):
+            assert buckets.take(limits) == 0
+
+    def test_rejected_hit_spends_no_tokens(self):
+        """Test a hit rejected by one bucket leaves the others untouched."""
+        buckets = LocalBuckets(maxsize=10)
+
+        with patch.object(rate_limit.time, "monotonic", return_value=100.0):
+            buckets.take({"global": (1.0, 1)})
+            assert buckets.take({"user": (1.0, 1), "global": (1.0, 1)}) > 0
+            assert buckets.take({"user": (1.0, 1)}) == 0
+
+
+class TestRateLimiter:
+    """Test RateLimiter against Redis and its fallback."""
+
+    @pytest.mark.asyncio
+    async def test_redis_script_decides(self, limits):
+        """Test user and global buckets are checked in one script call."""
+        script = AsyncMock(return_value=1500)
+        redis = MagicMock()
+        redis.register_script.return_value = script
+
+        with patch.object(rate_limit, "get_redis", return_value=redis):
+            wait = await RateLimiter("bot").hit(42)
+
+        assert wait == 1.5
+        script.assert_awaited_once_with(
+            keys=[
+                "vim_master:ratelimit:bot:user:42",
+                "vim_master:ratelimit:bot:global",
+            ],
+            args=[1.0, 2, 100.0, 100],
+        )
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_buckets(self, limits, redis_down):
+        """Test an unavailable Redis still limits each worker."""
+        limiter = RateLimiter("bot")
+
+        assert await limiter.hit(42) == 0
+        assert await limiter.hit(42) == 0
+        assert await limiter.hit(42) > 0
+        assert await limiter.hit(7) == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, redis_down):
+        """Test nothing is limited when rate limiting is off."""
+        assert await RateLimiter("bot").hit(42) == 0
+
+
+class TestRateLimitMiddleware:
+    """Test the bot and API middlewares reject over-limit traffic."""
+
+    @pytest.mark.asyncio
+    async def test_bot_update_is_dropped(self):
+        """Test a throttled update never reaches its handler."""
+        handler = AsyncMock()
+        update = MagicMock(spec=Update, callback_query=MagicMock(answer=AsyncMock()))
+
+        with patch.object(rate_limit.RateLimiter, "hit", AsyncMock(return_value=2.0)):
+            await RateLimitMiddleware()(
+                handler, update, {"event_from_user": MagicMock(id=42)}
+            )
+
+        handler.assert_not_called()
+        update.callback_query.answer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_api_request_gets_429(self):
+        """Test a throttled API request is answered with Retry-After."""
+        from app.main import app
+
+        with patch.object(rate_limit.RateLimiter, "hit", AsyncMock(return_value=2.5)):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://testserver"
+            ) as client:
+                response = await client.get("/api/v1/quests/chapters")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
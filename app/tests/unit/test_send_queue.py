@@ -0,0 +1,114 @@
+"""Unit tests for outbound send pacing."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import AnswerCallbackQuery, SendMessage
+
+from app.bot import send_queue as send_queue_module
+from app.bot.send_queue import SendLimiter, SendQueue
+
+pytestmark = pytest.mark.unit
+
+
+def flood_wait(retry_after: int = 3) -> TelegramRetryAfter:
+    return TelegramRetryAfter(
+        method=SendMessage(chat_id=42, text="hi"),
+        message="Too Many Requests",
+        retry_after=retry_after,
+    )
+
+
+@pytest.fixture
+def sleep():
+    with patch.object(send_queue_module.asyncio, "sleep", AsyncMock()) as sleep:
+        yield sleep
+
+
+class TestSendLimiter:
+    """Test outbound pacing is switched on its own."""
+
+    @pytest.mark.asyncio
+    async def test_ignores_inbound_switch(self, monkeypatch):
+        """Test disabling inbound flood control keeps replies paced."""
+        monkeypatch.setattr(send_queue_module.settings, "rate_limit_enabled", False)
+        monkeypatch.setattr(send_queue_module.settings, "send_pacing_enabled", True)
+        limiter = SendLimiter("send")
+        script = AsyncMock(return_value=500)
+
+        with patch.object(limiter, "_get_script", return_value=script):
+            assert await limiter.hit(42) == 0.5
+
+    @pytest.mark.asyncio
+    async def test_can_be_disabled(self, monkeypatch):
+        """Test send_pacing_enabled=False lets every send through."""
+        monkeypatch.setattr(send_queue_module.settings, "rate_limit_enabled", True)
+        limiter = SendLimiter("send")
+
+        with patch.object(limiter, "_get_script") as get_script:
+            assert await limiter.hit(42) == 0
+
+        get_script.assert_not_called()
+
+
+class TestSendQueue:
+    """Test SendQueue paces chat sends and retries flood waits."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_chat_token(self, sleep):
+        """Test a send waits until its chat and the bot have a token."""
+        queue = SendQueue(max_retries=3)
+        queue.limiter.hit = AsyncMock(side_effect=[0.5, 0.0])
+        make_request = AsyncMock(return_value="ok")
+
+        result = await queue(
+            make_request, MagicMock(), SendMessage(chat_id=42, text="hi")
+        )
+
+        assert result == "ok"
+        sleep.assert_awaited_once_with(0.5)
+        queue.limiter.hit.assert_awaited_with(42)
+        assert queue.stats()["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unpaced_methods(self, sleep):
+        """Test calls without a chat skip the buckets."""
+        queue = SendQueue(max_retries=3)
+        queue.limiter.hit = AsyncMock()
+        make_request = AsyncMock()
+
+        await queue(
+            make_request, MagicMock(), AnswerCallbackQuery(callback_query_id="1")
+        )
+
+        make_request.assert_awaited_once()
+        queue.limiter.hit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retries_flood_wait(self, sleep):
+        """Test a flood wait pauses sending and the call is retried."""
+        queue = SendQueue(max_retries=3)
+        make_request = AsyncMock(side_effect=[flood_wait(3), "ok"])
+
+        result = await queue(
+            make_request, MagicMock(), SendMessage(chat_id=42, text="hi")
+        )
+
+        assert result == "ok"
+        assert make_request.await_count == 2
+        assert sleep.await_args.args[0] == pytest.approx(3, abs=0.1)
+        assert queue.stats()["retried"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, sleep):
+        """Test a send still flood-waited after its retries fails."""
+        queue = SendQueue(max_retries=1)
+        make_request = AsyncMock(side_effect=[flood_wait(), flood_wait()])
+
+        with pytest.raises(TelegramRetryAfter):
+            await queue(make_request, MagicMock(), SendMessage(chat_id=42, text="hi"))
+
+        stats = queue.stats()
+        assert stats["failed"] == 1
+        assert stats["waiting"] == stats["in_flight"] == 0
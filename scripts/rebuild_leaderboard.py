@@ -0,0 +1,25 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.cache import close_redis
+from app.core.services.leaderboard import leaderboard_service
+from app.db.base import async_session_factory
+
+
+async def rebuild_leaderboard():
+    async with async_session_factory() as db:
+        try:
+            total = await leaderboard_service.rebuild(db)
+            print(f"✅ Leaderboard rebuilt with {total} users")
+        except Exception as e:
+            print(f"❌ Error rebuilding leaderboard: {e}")
+            raise
+        finally:
+            await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_leaderboard())
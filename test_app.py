@@ -1,32 +1,33 @@
 #!/usr/bin/env python3
 """Simple test script to verify VimMaster functionality."""
 
+import asyncio
 import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-os.environ["DATABASE_URL"] = "sqlite:///./vim_master.db"
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./vim_master.db"
 
 from app.core.services.game import game_service
 from app.core.services.quest import quest_service
 from app.core.services.user import user_service
-from app.db.base import SessionLocal, create_tables
+from app.db.base import async_session_factory, create_tables
 
 
-def test_basic_functionality():
+async def test_basic_functionality():
     """Test basic functionality of the VimMaster app."""
     print("🧪 Testing VimMaster basic functionality...")
 
     # Create database tables
-    create_tables()
-    db = SessionLocal()
+    await create_tables()
+    db = async_session_factory()
 
     try:
         # Test 1: Create user
         print("\n1. Testing user creation...")
-        user = user_service.get_or_create_user(
+        user = await user_service.get_or_create_user(
             db,
             telegram_id=12345,
             username="test_user",
@@ -37,31 +38,31 @@ def test_basic_functionality():
 
         # Test 2: Get available quests
         print("\n2. Testing quest retrieval...")
-        chapters = quest_service.get_available_chapters(db)
+        chapters = await quest_service.get_available_chapters(db)
         if chapters:
             chapter = chapters[0]
             print(f"✅ Found chapter: {chapter.title}")
 
-            quests = quest_service.get_chapter_quests(db, chapter.id)
+            quests = await quest_service.get_chapter_quests(db, chapter.id)
             if quests:
                 quest = quests[0]
                 print(f"✅ Found quest: {quest.title}")
 
                 # Test 3: Start quest
                 print("\n3. Testing quest gameplay...")
-                started_quest = game_service.start_quest(db, user, quest.id)
+                started_quest = await game_service.start_quest(db, user, quest.id)
                 if started_quest:
                     print(f"✅ Quest started: {started_quest.title}")
 
                     # Test 4: Submit correct answer
                     if quest.vim_command:
-                        is_correct, score, message = game_service.submit_answer(
+                        is_correct, score, message = await game_service.submit_answer(
                             db, user, quest.id, quest.vim_command
                         )
                         print(f"✅ Answer submitted: {message} (Score: {score})")
 
                         # Test 5: Check user progress
-                        progress_summary = game_service.get_user_progress_summary(
+                        progress_summary = await game_service.get_user_progress_summary(
                             db, user.id
                         )
                         print(
@@ -76,8 +77,8 @@ def test_basic_functionality():
 
         traceback.print_exc()
     finally:
-        db.close()
+        await db.close()
 
 
 if __name__ == "__main__":
-    test_basic_functionality()
+    asyncio.run(test_basic_functionality())